@@ -64,7 +64,7 @@ def demo_local_analysis(df):
             response, fig = analyze_data_locally(query, df)
             print("📊 Response:")
             print(response[:300] + "..." if len(response) > 300 else response)
-            if fig:
+            if fig is not None:
                 print("📈 Visualization: Chart generated successfully")
             else:
                 print("📈 Visualization: No chart generated")
@@ -3,75 +3,38 @@ import pandas as pd
 import warnings
 import base64
 import os
-import requests
 import io
+import importlib
 from datetime import datetime
 
-# Import page modules with error handling
+# Import shared modules with error handling
 try:
-    from pages import projects_health, support_tickets, dinh_kyle_sheet, revenue, chat_analytics
     from utils import data_loader, auth_handler
 except ImportError as e:
     st.error(f"Import error: {e}")
     st.error("Please ensure all required modules are present in the repository.")
     st.stop()
 
-warnings.filterwarnings('ignore')
-
-# ------------------ CONFIG ------------------
-st.set_page_config(page_title="Avathon Analytics Dashboard", page_icon="📊", layout="wide")
-
-# Hide Streamlit's default navigation and header
-st.markdown("""
-<style>
-    /* Hide the main menu */
-    #MainMenu {visibility: hidden;}
-    
-    /* Hide the header */
-    header {visibility: hidden;}
-    
-    /* Hide the footer */
-    footer {visibility: hidden;}
-    
-    /* Hide the "Made with Streamlit" footer */
-    .css-1lsmgbg {display: none;}
-    
-    /* Hide any navigation elements above sidebar */
-    .css-1d391kg, .css-1lcbmhc, .css-1outpf7 {display: none;}
-    
-    /* Hide the top navigation bar */
-    .stSelectbox > label {display: none;}
-    section[data-testid="stSidebar"] > div:first-child {margin-top: 0px;}
-    
-    /* Additional hiding for navigation elements */
-    [data-testid="stSidebarNav"] {display: none;}
-    section[data-testid="stSidebarNav"] {display: none;}
-    .css-1cypcdb {display: none;}
-    .css-1outpf7 {display: none;}
-    
-    /* Remove padding from top of sidebar */
-    .css-1d391kg {padding-top: 0rem;}
-    
-    /* Hide any automatic page navigation */
-    nav[role="navigation"] {display: none;}
-    .stSidebarNav {display: none;}
-    
-</style>
-""", unsafe_allow_html=True)
-
-# Initialize session state for chat
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+# Page modules are imported the first time their page is opened, so sessions
+# that never open a chart page do not pay for loading Plotly Express
+PAGE_MODULES = {
+    "Projects & Customer Health": "pages.projects_health",
+    "Support Tickets": "pages.support_tickets",
+    "Dinh and Kyle Sheet": "pages.dinh_kyle_sheet",
+    "Revenue": "pages.revenue",
+    "Chat Analytics": "pages.chat_analytics",
+}
 
-# Initialize session state for authentication
-if "authenticated" not in st.session_state:
-    st.session_state.authenticated = False
-if "username" not in st.session_state:
-    st.session_state.username = ""
+def load_page_module(page):
+    """Import the module that renders a page, with the same error handling as above"""
+    try:
+        return importlib.import_module(PAGE_MODULES[page])
+    except ImportError as e:
+        st.error(f"Import error: {e}")
+        st.error("Please ensure all required modules are present in the repository.")
+        st.stop()
 
-# Initialize session state for data source selections per page
-if "page_data_sources" not in st.session_state:
-    st.session_state.page_data_sources = {}
+warnings.filterwarnings('ignore')
 
 # ------------------ AUTHENTICATION ------------------
 
@@ -140,23 +103,20 @@ def show_logout_option():
                 st.session_state.username = ""
                 st.rerun()
 
-# Check authentication status
-if not st.session_state.authenticated:
-    show_login_page()
-    st.stop()  # Stop execution here if not authenticated
-
-# Show logout option in top right corner
-show_logout_option()
-
 # ------------------ SIDEBAR SETUP ------------------
 
+@st.cache_resource(show_spinner=False)
+def load_gif_data_url(gif_path):
+    """Read and base64-encode a GIF once per process"""
+    with open(gif_path, "rb") as gif_file:
+        contents = gif_file.read()
+    return base64.b64encode(contents).decode("utf-8")
+
 # Display logo at top of sidebar
 def display_sidebar_animated_gif(gif_path, width=250):
-    """Display animated GIF in sidebar using HTML"""
+    """Display animated GIF in sidebar using HTML, or a text logo if it is missing"""
     try:
-        with open(gif_path, "rb") as gif_file:
-            contents = gif_file.read()
-            data_url = base64.b64encode(contents).decode("utf-8")
+        data_url = load_gif_data_url(gif_path)
         
         st.sidebar.markdown(
             f'<div style="display: flex; justify-content: center; margin-bottom: 30px; margin-top: 10px;">'
@@ -165,99 +125,194 @@ def display_sidebar_animated_gif(gif_path, width=250):
             unsafe_allow_html=True
         )
         return True
+    except FileNotFoundError:
+        st.sidebar.markdown(
+            '<div style="text-align: center; margin-bottom: 30px; margin-top: 10px;">'
+            '<h3 style="color: #1f77b4; font-family: Arial Black;">🚀 Avathon Analytics</h3>'
+            '</div>',
+            unsafe_allow_html=True
+        )
+        return False
     except Exception as e:
         st.sidebar.error(f"Could not load logo: {str(e)}")
         return False
 
-# Display logo or fallback
-logo_path = "Untitled design.gif"
-if os.path.exists(logo_path):
-    display_sidebar_animated_gif(logo_path, width=250)
-else:
-    st.sidebar.markdown(
-        '<div style="text-align: center; margin-bottom: 30px; margin-top: 10px;">'
-        '<h3 style="color: #1f77b4; font-family: Arial Black;">🚀 Avathon Analytics</h3>'
-        '</div>',
-        unsafe_allow_html=True
-    )
+# ------------------ PRE-WARM ------------------
 
-# Navigation
-st.sidebar.title("Navigation")
-page = st.sidebar.selectbox(
-    "Go to",
-    ("Projects & Customer Health", "Support Tickets", "Dinh and Kyle Sheet", "Revenue", "Chat Analytics")
-)
-
-# Authentication and configuration sections
-auth_handler.setup_authentication_ui()
-
-# ------------------ DATA LOADING ------------------
-
-# Page-specific default data sources
-page_defaults = {
-    "Projects & Customer Health": "Use Google Sheets Data",
-    "Support Tickets": "Use Default File", 
-    "Revenue": "Use Default File",
-    "Dinh and Kyle Sheet": "Use Default File",
-    "Chat Analytics": "Use Default File"
-}
+LOGO_PATH = "Untitled design.gif"
 
-# Get default for current page (use stored preference or page default)
-if page in st.session_state.page_data_sources:
-    current_default = st.session_state.page_data_sources[page]
-else:
-    current_default = page_defaults.get(page, "Use Default File")
-
-# Data source selection with page-specific default
-data_source_options = ("Use Google Sheets Data", "Upload File", "Enter URL", "Use Default File")
-default_index = data_source_options.index(current_default)
-
-data_source = st.radio(
-    f"Choose data source for {page}:", 
-    data_source_options,
-    index=default_index,
-    help=f"Default for {page}: {page_defaults.get(page, 'Use Default File')}"
-)
-
-# Store the user's selection for this page
-st.session_state.page_data_sources[page] = data_source
-
-# Load data based on selected source and page
-df, df_filtered = data_loader.load_data(data_source, page)
-
-# Apply filters
-if not df_filtered.empty:
-    df_filtered = data_loader.apply_filters(df_filtered)
-
-# ------------------ PAGE ROUTING ------------------
-
-# Route to appropriate page based on selection
-if not df_filtered.empty or page == "Chat Analytics":
-    if page == "Projects & Customer Health":
-        projects_health.show_page(df_filtered)
-    elif page == "Support Tickets":
-        support_tickets.show_page(df_filtered)
-    elif page == "Dinh and Kyle Sheet":
-        dinh_kyle_sheet.show_page()
-    elif page == "Revenue":
-        revenue.show_page(df_filtered)
-    elif page == "Chat Analytics":
-        chat_analytics.show_page(df)
-    
-    # Common Footer
-    st.markdown("---")
-    st.markdown(
-        """<div style='text-align: center; color: #333; font-size: 14px;'><small>© 2025 Avathon Analytics | Internal</small></div>""",
-        unsafe_allow_html=True,
+# Cached as a resource so the body runs once per process; later runs only
+# look the entry up. It runs inside the first run rather than on a thread,
+# so no session's context is shared and nothing happens at import time
+@st.cache_resource(show_spinner=False)
+def prewarm():
+    """Fill process-wide caches on the first run so later sessions find them populated"""
+    try:
+        load_gif_data_url(LOGO_PATH)
+    except OSError:
+        pass
+
+    # Default sample data for the "Use Default File" source; the Google Sheets
+    # default is a network fetch and is left to the session that first asks
+    data_path = data_loader.local_data_path("Data1.csv")
+    try:
+        data_loader.read_local_csv(data_path, os.path.getmtime(data_path))
+    except OSError:
+        pass
+
+# ------------------ APP ------------------
+
+def render():
+    """Render the dashboard for the current Streamlit run"""
+    # Uploads are parsed in data_loader, so no file object reaches this function
+    uploaded_file = None
+
+    # ------------------ CONFIG ------------------
+    st.set_page_config(page_title="Avathon Analytics Dashboard", page_icon="📊", layout="wide")
+    prewarm()
+
+    # Hide Streamlit's default navigation and header
+    st.markdown("""
+    <style>
+        /* Hide the main menu */
+        #MainMenu {visibility: hidden;}
+
+        /* Hide the header */
+        header {visibility: hidden;}
+
+        /* Hide the footer */
+        footer {visibility: hidden;}
+
+        /* Hide the "Made with Streamlit" footer */
+        .css-1lsmgbg {display: none;}
+
+        /* Hide any navigation elements above sidebar */
+        .css-1d391kg, .css-1lcbmhc, .css-1outpf7 {display: none;}
+
+        /* Hide the top navigation bar */
+        .stSelectbox > label {display: none;}
+        section[data-testid="stSidebar"] > div:first-child {margin-top: 0px;}
+
+        /* Additional hiding for navigation elements */
+        [data-testid="stSidebarNav"] {display: none;}
+        section[data-testid="stSidebarNav"] {display: none;}
+        .css-1cypcdb {display: none;}
+        .css-1outpf7 {display: none;}
+
+        /* Remove padding from top of sidebar */
+        .css-1d391kg {padding-top: 0rem;}
+
+        /* Hide any automatic page navigation */
+        nav[role="navigation"] {display: none;}
+        .stSidebarNav {display: none;}
+
+    </style>
+    """, unsafe_allow_html=True)
+
+    # Initialize session state for chat
+    if "messages" not in st.session_state:
+        st.session_state.messages = []
+
+    # Initialize session state for authentication
+    if "authenticated" not in st.session_state:
+        st.session_state.authenticated = False
+    if "username" not in st.session_state:
+        st.session_state.username = ""
+
+    # Initialize session state for data source selections per page
+    if "page_data_sources" not in st.session_state:
+        st.session_state.page_data_sources = {}
+
+    # Check authentication status
+    if not st.session_state.authenticated:
+        show_login_page()
+        st.stop()  # Stop execution here if not authenticated
+
+    # Show logout option in top right corner
+    show_logout_option()
+
+    # ------------------ SIDEBAR SETUP ------------------
+
+    # Display logo or fallback
+    display_sidebar_animated_gif(LOGO_PATH, width=250)
+
+    # Navigation
+    st.sidebar.title("Navigation")
+    page = st.sidebar.selectbox(
+        "Go to",
+        ("Projects & Customer Health", "Support Tickets", "Dinh and Kyle Sheet", "Revenue", "Chat Analytics")
     )
 
-# Handle empty data scenarios
-elif df.empty and (data_source != "Upload File" or (data_source == "Upload File" and ('uploaded_file' not in locals() or uploaded_file is None))):
-    if page == "Chat Analytics":
-        chat_analytics.show_page(pd.DataFrame())
+    # Authentication and configuration sections
+    auth_handler.setup_authentication_ui()
+
+    # ------------------ DATA LOADING ------------------
+
+    # Page-specific default data sources
+    page_defaults = {
+        "Projects & Customer Health": "Use Google Sheets Data",
+        "Support Tickets": "Use Default File", 
+        "Revenue": "Use Default File",
+        "Dinh and Kyle Sheet": "Use Default File",
+        "Chat Analytics": "Use Default File"
+    }
+
+    # Get default for current page (use stored preference or page default)
+    if page in st.session_state.page_data_sources:
+        current_default = st.session_state.page_data_sources[page]
     else:
-        st.info("Please load a dataset using one of the options at the top to view the dashboard.")
-elif not df.empty and df_filtered.empty:
-    st.warning("No data matches the current filter criteria. Please adjust your filters in the sidebar.")
-    if page == "Chat Analytics":
-        chat_analytics.show_page(df) 
\ No newline at end of file
+        current_default = page_defaults.get(page, "Use Default File")
+
+    # Data source selection with page-specific default
+    data_source_options = ("Use Google Sheets Data", "Upload File", "Enter URL", "Use Default File")
+    default_index = data_source_options.index(current_default)
+
+    data_source = st.radio(
+        f"Choose data source for {page}:", 
+        data_source_options,
+        index=default_index,
+        help=f"Default for {page}: {page_defaults.get(page, 'Use Default File')}"
+    )
+
+    # Store the user's selection for this page
+    st.session_state.page_data_sources[page] = data_source
+
+    # Load data based on selected source and page
+    df, df_filtered = data_loader.load_data(data_source, page)
+
+    # Apply filters
+    if not df_filtered.empty:
+        df_filtered = data_loader.apply_filters(df_filtered)
+
+    # ------------------ PAGE ROUTING ------------------
+
+    # Route to appropriate page based on selection
+    if not df_filtered.empty or page == "Chat Analytics":
+        page_module = load_page_module(page)
+        if page == "Dinh and Kyle Sheet":
+            page_module.show_page()
+        elif page == "Chat Analytics":
+            page_module.show_page(df)
+        else:
+            page_module.show_page(df_filtered)
+
+        # Common Footer
+        st.markdown("---")
+        st.markdown(
+            """<div style='text-align: center; color: #333; font-size: 14px;'><small>© 2025 Avathon Analytics | Internal</small></div>""",
+            unsafe_allow_html=True,
+        )
+
+    # Handle empty data scenarios
+    elif df.empty and (data_source != "Upload File" or (data_source == "Upload File" and uploaded_file is None)):
+        if page == "Chat Analytics":
+            load_page_module(page).show_page(pd.DataFrame())
+        else:
+            st.info("Please load a dataset using one of the options at the top to view the dashboard.")
+    elif not df.empty and df_filtered.empty:
+        st.warning("No data matches the current filter criteria. Please adjust your filters in the sidebar.")
+        if page == "Chat Analytics":
+            load_page_module(page).show_page(df) 
+
+if __name__ == "__main__":
+    render()
@@ -1,31 +1,115 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 import re
 import random
 import string
 import json
-from typing import Tuple, Optional, Any
+import functools
+import importlib.util
+from typing import TYPE_CHECKING, Tuple, Optional, Any, Union
+from utils.data_loader import month_start
 
-# LLM Integration
-try:
-    import openai
-    HAS_OPENAI = True
-except ImportError:
-    HAS_OPENAI = False
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
-try:
-    from anthropic import Anthropic
-    HAS_ANTHROPIC = True
-except ImportError:
-    HAS_ANTHROPIC = False
+# LLM Integration; the client libraries are only checked for here and are
+# imported when a backend is actually called, keeping them off page load
+HAS_OPENAI = importlib.util.find_spec("openai") is not None
+HAS_ANTHROPIC = importlib.util.find_spec("anthropic") is not None
+HAS_REQUESTS = importlib.util.find_spec("requests") is not None
 
-try:
-    import requests
-    HAS_REQUESTS = True
-except ImportError:
-    HAS_REQUESTS = False
+def _px():
+    """Import plotly.express on first use; most chat answers are text only"""
+    import plotly.express as px
+    return px
+
+def counts_pie(counts, title):
+    """Pie chart of a value_counts Series, built from graph objects directly"""
+    # px.pie would first wrap the two arrays in a DataFrame and infer a schema
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Pie(labels=counts.index.tolist(), values=counts.to_numpy()))
+    fig.update_layout(title=title)
+    return fig
+
+def first_in_value_order(values):
+    """Smallest of several tied values, the one mode() lists first for text columns"""
+    # Categorical and Arrow-string columns list ties in their own order instead
+    values = list(values)
+    try:
+        return min(values)
+    except TypeError:
+        return values[0]
+
+# Patterns used on every chat turn, compiled once at import
+VISUALIZATION_LINE_RE = re.compile(r'VISUALIZATION:.*?\n', re.IGNORECASE)
+VISUALIZATION_SPEC_RE = re.compile(r'VISUALIZATION:\s*([^|]+)\|([^|]+)\|([^|]+)\|([^|]*)\|([^|\n]+)', re.IGNORECASE)
+STATUS_COUNT_QUESTION_RE = re.compile(r"how many projects (?:have|are)(?: project)? status(?: as| is| =)? (?P<color>red|green|yellow|amber|r\b|g\b|y\b|a\b)")
+
+def keyword_pattern(*terms):
+    """Compile literal keywords into one alternation, so a question is scanned once"""
+    return re.compile("|".join(map(re.escape, terms)))
+
+GREETING_RE = keyword_pattern("hello", "hi", "hey", "help", "what can you do")
+COLUMN_LIST_RE = keyword_pattern("what columns", "available columns", "what data", "show columns", "list columns")
+SUMMARY_RE = keyword_pattern("summary", "statistics", "describe")
+FREE_AI_RE = keyword_pattern("free ai", "no setup")
+EXECUTIVE_TERMS_RE = keyword_pattern("executive", "exec", "owner")
+CUSTOMER_TERMS_RE = keyword_pattern("customer", "client")
+REVENUE_TERMS_RE = keyword_pattern("revenue", "financial", "money")
+
+# Name fragments that identify a column's role in the heuristics below
+COLUMN_ROLE_TERMS = {
+    "status": ("status",),
+    "customer": ("customer",),
+    "revenue": ("revenue",),
+    "executive": ("executive", "exective", "owner"),
+    "health": ("health",),
+}
+
+@functools.lru_cache(maxsize=32)
+def lowered_column_names(columns: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Lowercase column names once per distinct set of columns"""
+    return tuple(col.lower() for col in columns)
+
+@functools.lru_cache(maxsize=32)
+def column_name_pattern(columns: Tuple[str, ...]):
+    """One alternation over the lowercased column names (longest first) and a lookup back to them"""
+    by_lower = {}
+    for col, col_lower in zip(columns, lowered_column_names(columns)):
+        by_lower.setdefault(col_lower, col)
+    pattern = re.compile("|".join(re.escape(name) for name in sorted(by_lower, key=len, reverse=True)))
+    return pattern, by_lower
+
+def mentioned_column(columns, question_lower: str) -> Optional[str]:
+    """Column whose name appears in the question, found in a single regex scan"""
+    if not columns:
+        return None
+    pattern, by_lower = column_name_pattern(tuple(columns))
+    match = pattern.search(question_lower)
+    return by_lower[match.group(0)] if match else None
+
+@functools.lru_cache(maxsize=64)
+def column_roles(columns: Tuple[str, ...]) -> dict:
+    """Group column names by the role their name suggests, once per column set"""
+    lowered = lowered_column_names(columns)
+    roles = {role: [col for col, col_lower in zip(columns, lowered) if any(term in col_lower for term in terms)]
+             for role, terms in COLUMN_ROLE_TERMS.items()}
+    roles["end_date"] = [col for col, col_lower in zip(columns, lowered) if 'date' in col_lower and 'end' in col_lower]
+    return roles
+
+@functools.lru_cache(maxsize=32)
+def _columns_by_type(columns: Tuple[str, ...], dtypes: Tuple[str, ...]) -> Tuple[Tuple[str, ...], ...]:
+    numeric = tuple(col for col, dtype in zip(columns, dtypes) if dtype in ('int64', 'float64'))
+    categorical = tuple(col for col, dtype in zip(columns, dtypes) if dtype in ('object', 'category', 'string'))
+    dates = tuple(col for col, dtype in zip(columns, dtypes) if dtype.startswith('datetime64[') and ',' not in dtype)
+    return numeric, categorical, dates
+
+def split_columns_by_type(data: pd.DataFrame) -> Tuple[list, list, list, list]:
+    """Return available, numeric, categorical and date columns, cached per schema"""
+    columns = tuple(data.columns)
+    numeric, categorical, dates = _columns_by_type(columns, tuple(str(dtype) for dtype in data.dtypes))
+    return list(columns), list(numeric), list(categorical), list(dates)
 
 def show_page(df):
     """Display the Chat Analytics page"""
@@ -37,7 +121,7 @@ def show_page(df):
     setup_llm_configuration()
     
     # Use the original, unfiltered df for chat Q&A to provide broader answers
-    chat_data_context = df.copy() if not df.empty else pd.DataFrame()
+    chat_data_context = df if not df.empty else pd.DataFrame()
 
     display_faq(chat_data_context)
     st.markdown("---")
@@ -224,7 +308,7 @@ def display_chat_interface(chat_data_context):
             if isinstance(message["content"], tuple):
                 st.markdown(message["content"][0])
                 if message["content"][1] is not None:
-                    st.plotly_chart(message["content"][1], use_container_width=True)
+                    display_chat_attachment(message["content"][1])
             else:
                 st.markdown(message["content"])
 
@@ -239,27 +323,34 @@ def display_chat_interface(chat_data_context):
                 response, fig = analyze_with_ai(prompt, chat_data_context)
                 st.markdown(response)
                 if fig is not None:
-                    st.plotly_chart(fig, use_container_width=True)
+                    display_chat_attachment(fig)
                 st.session_state.messages.append({"role": "assistant", "content": (response, fig)})
 
+def display_chat_attachment(attachment):
+    """Render the chart or table attached to a chat answer"""
+    if isinstance(attachment, pd.DataFrame):
+        st.dataframe(attachment, use_container_width=True)
+    else:
+        st.plotly_chart(attachment, use_container_width=True)
+
 def get_smart_suggestions(data):
     """Generate smart suggestions based on available data"""
     suggestions = []
     
     if not data.empty:
-        columns = data.columns.tolist()
+        roles = column_roles(tuple(data.columns))
         
         # Dynamic suggestions based on available columns
-        if any("status" in col.lower() for col in columns):
+        if roles["status"]:
             suggestions.append("📊 What's the distribution of project statuses and what insights can you provide?")
         
-        if any("revenue" in col.lower() for col in columns):
+        if roles["revenue"]:
             suggestions.append("💰 Analyze our revenue performance and identify key trends")
         
-        if any("customer" in col.lower() for col in columns):
+        if roles["customer"]:
             suggestions.append("👥 Which customers need attention and why?")
         
-        if any("executive" in col.lower() or "owner" in col.lower() for col in columns):
+        if roles["executive"]:
             suggestions.append("🎯 How are different executives performing and what recommendations do you have?")
         
         # Add general suggestions
@@ -352,6 +443,7 @@ For now, here's local analysis:
 
 def analyze_with_openai(question: str, data: pd.DataFrame) -> Tuple[str, Optional[Any]]:
     """Analyze data using OpenAI GPT with structured prompts"""
+    import openai
     
     # Prepare data context
     data_summary = prepare_data_context(data)
@@ -410,7 +502,7 @@ def analyze_with_openai(question: str, data: pd.DataFrame) -> Tuple[str, Optiona
         fig = extract_and_create_visualization(ai_response, data)
         
         # Clean up response (remove visualization instruction from display)
-        clean_response = re.sub(r'VISUALIZATION:.*?\n', '', ai_response, flags=re.IGNORECASE)
+        clean_response = VISUALIZATION_LINE_RE.sub('', ai_response)
         
         # Add AI attribution
         final_response = f"🤖 **AI Analysis:**\n\n{clean_response}"
@@ -422,6 +514,7 @@ def analyze_with_openai(question: str, data: pd.DataFrame) -> Tuple[str, Optiona
 
 def analyze_with_free_llm(question: str, data: pd.DataFrame) -> Tuple[str, Optional[Any]]:
     """Analyze data using free Hugging Face models"""
+    import requests
     
     # Prepare data context
     data_summary = prepare_data_context(data)
@@ -513,7 +606,7 @@ Answer:"""
                 fig = extract_and_create_visualization(ai_response, data)
             
             # Clean up response (remove visualization instruction from display)
-            clean_response = re.sub(r'VISUALIZATION:.*?\n', '', ai_response, flags=re.IGNORECASE)
+            clean_response = VISUALIZATION_LINE_RE.sub('', ai_response)
             
             # Add AI attribution
             final_response = f"🤖 **Free AI Analysis** (Model: {model.split('/')[-1]}):\n\n{clean_response}"
@@ -546,6 +639,7 @@ Answer:"""
 
 def analyze_with_anthropic(question: str, data: pd.DataFrame) -> Tuple[str, Optional[Any]]:
     """Analyze data using Anthropic Claude with structured prompts"""
+    from anthropic import Anthropic
     
     # Prepare data context
     data_summary = prepare_data_context(data)
@@ -600,7 +694,7 @@ Be specific and reference actual data points when possible."""
         fig = extract_and_create_visualization(ai_response, data)
         
         # Clean up response (remove visualization instruction from display)
-        clean_response = re.sub(r'VISUALIZATION:.*?\n', '', ai_response, flags=re.IGNORECASE)
+        clean_response = VISUALIZATION_LINE_RE.sub('', ai_response)
         
         # Add AI attribution
         final_response = f"🤖 **Claude AI Analysis:**\n\n{clean_response}"
@@ -629,7 +723,7 @@ def prepare_data_context(data: pd.DataFrame) -> str:
         non_null = data[col].count()
         unique_vals = data[col].nunique()
         
-        if data[col].dtype in ['object', 'category']:
+        if data[col].dtype in ['object', 'category', 'string']:
             sample_values = data[col].dropna().unique()[:3]
             context += f"- {col} ({dtype}): {non_null} non-null, {unique_vals} unique. Sample: {list(sample_values)}\n"
         else:
@@ -640,13 +734,13 @@ def prepare_data_context(data: pd.DataFrame) -> str:
         context += f"\nKey Insights:\n"
         
         # Status distribution if available
-        status_cols = [col for col in data.columns if 'status' in col.lower()]
+        status_cols = column_roles(tuple(data.columns))["status"]
         if status_cols:
             status_dist = data[status_cols[0]].value_counts().head(3)
             context += f"- Status distribution: {dict(status_dist)}\n"
         
         # Revenue info if available
-        revenue_cols = [col for col in data.columns if 'revenue' in col.lower()]
+        revenue_cols = column_roles(tuple(data.columns))["revenue"]
         if revenue_cols:
             total_revenue = data[revenue_cols[0]].sum()
             context += f"- Total revenue: ${total_revenue:,.0f}\n"
@@ -656,17 +750,15 @@ def prepare_data_context(data: pd.DataFrame) -> str:
 def extract_and_create_visualization(ai_response: str, data: pd.DataFrame) -> Optional[Any]:
     """Extract visualization instructions from AI response and create the chart"""
     
-    viz_match = re.search(r'VISUALIZATION:\s*([^|]+)\|([^|]+)\|([^|]+)\|([^|]*)\|([^|\n]+)', ai_response, re.IGNORECASE)
+    viz_match = VISUALIZATION_SPEC_RE.search(ai_response)
     
     if not viz_match or data.empty:
         return None
     
     try:
-        chart_type = viz_match.group(1).strip().lower()
-        x_col = viz_match.group(2).strip()
-        y_col = viz_match.group(3).strip()
-        color_col = viz_match.group(4).strip() or None
-        title = viz_match.group(5).strip()
+        chart_type, x_col, y_col, color_col, title = (group.strip() for group in viz_match.groups())
+        chart_type = chart_type.lower()
+        color_col = color_col or None
         
         # Validate columns exist
         if x_col not in data.columns or y_col not in data.columns:
@@ -677,25 +769,24 @@ def extract_and_create_visualization(ai_response: str, data: pd.DataFrame) -> Op
         
         # Create visualization based on type
         if chart_type == 'bar':
-            if data[x_col].dtype in ['object', 'category']:
-                grouped_data = data.groupby(x_col)[y_col].sum().reset_index()
-                fig = px.bar(grouped_data, x=x_col, y=y_col, color=color_col, title=title)
+            if data[x_col].dtype in ['object', 'category', 'string']:
+                grouped_data = data.groupby(x_col, observed=True)[y_col].sum().reset_index()
+                fig = _px().bar(grouped_data, x=x_col, y=y_col, color=color_col, title=title)
             else:
-                fig = px.bar(data, x=x_col, y=y_col, color=color_col, title=title)
+                fig = _px().bar(data, x=x_col, y=y_col, color=color_col, title=title)
         elif chart_type == 'pie':
-            if data[x_col].dtype in ['object', 'category']:
-                pie_data = data[x_col].value_counts().reset_index()
-                fig = px.pie(pie_data, names='index', values=x_col, title=title)
+            if data[x_col].dtype in ['object', 'category', 'string']:
+                fig = counts_pie(data[x_col].value_counts(), title)
             else:
                 return None
         elif chart_type == 'line':
-            fig = px.line(data, x=x_col, y=y_col, color=color_col, title=title)
+            fig = _px().line(data, x=x_col, y=y_col, color=color_col, title=title)
         elif chart_type == 'scatter':
-            fig = px.scatter(data, x=x_col, y=y_col, color=color_col, title=title)
+            fig = _px().scatter(data, x=x_col, y=y_col, color=color_col, title=title)
         elif chart_type == 'box':
-            fig = px.box(data, x=x_col, y=y_col, color=color_col, title=title)
+            fig = _px().box(data, x=x_col, y=y_col, color=color_col, title=title)
         elif chart_type == 'histogram':
-            fig = px.histogram(data, x=x_col, color=color_col, title=title)
+            fig = _px().histogram(data, x=x_col, color=color_col, title=title)
         else:
             return None
         
@@ -706,54 +797,26 @@ def extract_and_create_visualization(ai_response: str, data: pd.DataFrame) -> Op
         st.warning(f"Could not create suggested visualization: {str(e)}")
         return None
 
-def analyze_data_locally(question: str, data: pd.DataFrame) -> Tuple[str, Optional[Any]]:
-    """Enhanced local analysis with better pattern matching and insights"""
+def analyze_data_locally(question: str, data: pd.DataFrame) -> Tuple[str, Optional[Union["go.Figure", pd.DataFrame]]]:
+    """Enhanced local analysis with better pattern matching and insights; statistics answers attach a table instead of a chart"""
     
     question_lower = question.lower().strip()
     
     try:
         # Handle empty data
         if data.empty:
-            if "free ai" in question_lower or "no setup" in question_lower:
+            if FREE_AI_RE.search(question_lower):
                 return "🆓 **Free AI Available!** Go to the sidebar and select 'Free LLM (Hugging Face)' for AI-powered analysis with no setup required. It works immediately!", None
             return "I need data to answer questions. Please load or adjust filters on other pages.", None
             
         # Get available columns and their data types
-        available_columns = list(data.columns)
-        numeric_columns = data.select_dtypes(include=['int64', 'float64']).columns.tolist()
-        categorical_columns = data.select_dtypes(include=['object', 'category']).columns.tolist()
-        date_columns = data.select_dtypes(include=['datetime64']).columns.tolist()
-        
-        # Enhanced pattern matching with more intelligence
-        
-        # Handle AI-related questions
-        if any(term in question_lower for term in ["ai", "llm", "free ai", "artificial intelligence", "machine learning"]):
-            return "🤖 **AI Features Available!**\n\n" + \
-                   "Choose from these AI options in the sidebar:\n" + \
-                   "- 🆓 **Free LLM (Hugging Face)**: No setup required, works immediately!\n" + \
-                   "- 💰 **OpenAI GPT**: Requires API key, very powerful\n" + \
-                   "- 🧠 **Anthropic Claude**: Requires API key, excellent reasoning\n\n" + \
-                   "The Free LLM option is perfect to start with - just select it and start asking questions!", None
+        available_columns, numeric_columns, categorical_columns, date_columns = split_columns_by_type(data)
         
-        # Comprehensive analysis requests
-        if any(term in question_lower for term in ["comprehensive", "full analysis", "overview", "summary", "insights"]):
-            return generate_comprehensive_analysis(data, available_columns, numeric_columns, categorical_columns)
-        
-        # Risk and issue identification
-        if any(term in question_lower for term in ["risk", "issue", "problem", "concern", "alert"]):
-            return identify_risks_and_issues(data, available_columns)
-        
-        # Recommendations and actions
-        if any(term in question_lower for term in ["recommend", "action", "should do", "next steps", "improve"]):
-            return generate_recommendations(data, available_columns)
-        
-        # Performance analysis
-        if any(term in question_lower for term in ["performance", "performing", "best", "worst", "top", "bottom"]):
-            return analyze_performance(data, available_columns, question_lower)
-        
-        # Trend analysis
-        if any(term in question_lower for term in ["trend", "pattern", "over time", "timeline", "historical"]):
-            return analyze_trends(data, date_columns, numeric_columns, question_lower)
+        # Dispatch to the first intent whose keywords appear in the question
+        if LOCAL_ANALYSIS_ANY_RE.search(question_lower):
+            for pattern, handler in LOCAL_ANALYSIS_INTENTS:
+                if pattern.search(question_lower):
+                    return handler(data, question_lower, available_columns, numeric_columns, categorical_columns, date_columns)
         
         # Fall back to original analysis for specific queries
         return analyze_data_for_chat_original(question, data)
@@ -761,6 +824,15 @@ def analyze_data_locally(question: str, data: pd.DataFrame) -> Tuple[str, Option
     except Exception as e:
         return f"I encountered an error analyzing the data: {str(e)}\n\nTry asking a different question or check if the columns you're asking about exist in the data.", None
 
+def describe_ai_features(*_):
+    """Explain the AI backends available in the sidebar"""
+    return "🤖 **AI Features Available!**\n\n" + \
+           "Choose from these AI options in the sidebar:\n" + \
+           "- 🆓 **Free LLM (Hugging Face)**: No setup required, works immediately!\n" + \
+           "- 💰 **OpenAI GPT**: Requires API key, very powerful\n" + \
+           "- 🧠 **Anthropic Claude**: Requires API key, excellent reasoning\n\n" + \
+           "The Free LLM option is perfect to start with - just select it and start asking questions!", None
+
 def generate_comprehensive_analysis(data, available_columns, numeric_columns, categorical_columns):
     """Generate a comprehensive analysis of the dataset"""
     
@@ -778,39 +850,40 @@ def generate_comprehensive_analysis(data, available_columns, numeric_columns, ca
         analysis += "**Key Categorical Insights:**\n"
         for col in categorical_columns[:3]:  # Top 3 categorical columns
             if not data[col].empty:
-                top_value = data[col].mode()[0] if len(data[col].mode()) > 0 else "N/A"
+                modes = data[col].mode()
+                top_value = first_in_value_order(modes) if len(modes) > 0 else "N/A"
                 unique_count = data[col].nunique()
                 analysis += f"- {col}: {unique_count} unique values, most common: '{top_value}'\n"
         analysis += "\n"
     
     if numeric_columns:
         analysis += "**Key Numeric Insights:**\n"
-        for col in numeric_columns[:3]:  # Top 3 numeric columns
-            mean_val = data[col].mean()
-            max_val = data[col].max()
-            min_val = data[col].min()
+        # One aggregate call over the top 3 numeric columns instead of three per column
+        numeric_stats = data[numeric_columns[:3]].agg(["mean", "max", "min"])
+        for col in numeric_columns[:3]:
+            mean_val, max_val, min_val = numeric_stats[col]
             analysis += f"- {col}: Range {min_val:.2f} to {max_val:.2f}, Average: {mean_val:.2f}\n"
         analysis += "\n"
     
     # Status analysis if available
-    status_cols = [col for col in categorical_columns if 'status' in col.lower()]
+    status_cols = column_roles(tuple(categorical_columns))["status"]
+    status_dist = None
     if status_cols:
         status_col = status_cols[0]
         status_dist = data[status_col].value_counts()
         analysis += f"**Status Analysis ({status_col}):**\n"
-        for status, count in status_dist.head(5).items():
-            pct = (count / len(data)) * 100
-            analysis += f"- {status}: {count} ({pct:.1f}%)\n"
+        top_statuses = status_dist.head(5)
+        pcts = np.char.mod("%.1f", top_statuses.to_numpy() / len(data) * 100)
+        lines = "- " + top_statuses.index.astype(str) + ": " + top_statuses.astype(str).to_numpy() + " (" + pcts + "%)\n"
+        analysis += "".join(lines)
         analysis += "\n"
     
     # Create a summary visualization
     fig = None
-    if status_cols:
-        status_counts = data[status_cols[0]].value_counts()
-        fig = px.pie(values=status_counts.values, names=status_counts.index, 
-                    title=f"Distribution of {status_cols[0]}")
+    if status_dist is not None:
+        fig = counts_pie(status_dist, f"Distribution of {status_cols[0]}")
     elif len(numeric_columns) > 0:
-        fig = px.histogram(data, x=numeric_columns[0], title=f"Distribution of {numeric_columns[0]}")
+        fig = _px().histogram(data, x=numeric_columns[0], title=f"Distribution of {numeric_columns[0]}")
     
     return analysis, fig
 
@@ -822,10 +895,10 @@ def identify_risks_and_issues(data, available_columns):
     fig = None
     
     # Check for status-related risks
-    status_cols = [col for col in available_columns if 'status' in col.lower()]
+    status_cols = column_roles(tuple(available_columns))["status"]
     if status_cols:
         status_col = status_cols[0]
-        red_statuses = data[data[status_col].isin(['Red', 'R'])].shape[0]
+        red_statuses = int(data[status_col].isin(['Red', 'R']).sum())
         total = len(data)
         
         if red_statuses > 0:
@@ -836,27 +909,28 @@ def identify_risks_and_issues(data, available_columns):
             # Create visualization for status risks
             status_counts = data[status_col].value_counts()
             colors = ['#d62728' if 'Red' in str(x) or 'R' == str(x) else '#ff7f0e' if 'Yellow' in str(x) or 'Y' == str(x) else '#2ca02c' for x in status_counts.index]
-            fig = px.bar(x=status_counts.index, y=status_counts.values, 
+            fig = _px().bar(x=status_counts.index, y=status_counts.values, 
                         title="Project Status Distribution - Risk Analysis",
                         color=status_counts.index,
                         color_discrete_sequence=colors)
     
     # Check for customer concentration risk
-    customer_cols = [col for col in available_columns if 'customer' in col.lower()]
+    customer_cols = column_roles(tuple(available_columns))["customer"]
     if customer_cols:
         customer_col = customer_cols[0]
-        top_customer_pct = (data[customer_col].value_counts().iloc[0] / len(data)) * 100
+        customer_counts = data[customer_col].value_counts()
+        top_customer_pct = (customer_counts.iloc[0] / len(data)) * 100
         
         if top_customer_pct > 30:
             risk_count += 1
-            top_customer = data[customer_col].value_counts().index[0]
+            top_customer = customer_counts.index[0]
             risks += f"⚠️ **Customer Concentration Risk**: {top_customer} represents {top_customer_pct:.1f}% of projects\n\n"
     
     # Check for date-related risks
-    date_cols = [col for col in available_columns if 'date' in col.lower() and 'end' in col.lower()]
+    date_cols = column_roles(tuple(available_columns))["end_date"]
     if date_cols:
         date_col = date_cols[0]
-        overdue = data[data[date_col] < pd.Timestamp.now()].shape[0]
+        overdue = int((data[date_col] < pd.Timestamp.now()).sum())
         
         if overdue > 0:
             risk_count += 1
@@ -876,13 +950,13 @@ def generate_recommendations(data, available_columns):
     fig = None
     
     # Status-based recommendations
-    status_cols = [col for col in available_columns if 'status' in col.lower()]
+    status_cols = column_roles(tuple(available_columns))["status"]
     if status_cols:
         status_col = status_cols[0]
         status_counts = data[status_col].value_counts()
         
-        red_count = sum(data[status_col].isin(['Red', 'R']))
-        yellow_count = sum(data[status_col].isin(['Yellow', 'Y', 'Amber', 'A']))
+        red_count = int(data[status_col].isin(['Red', 'R']).sum())
+        yellow_count = int(data[status_col].isin(['Yellow', 'Y', 'Amber', 'A']).sum())
         
         if red_count > 0:
             rec_count += 1
@@ -899,7 +973,7 @@ def generate_recommendations(data, available_columns):
             recommendations += "   - Resource reallocation if needed\n\n"
     
     # Executive/Owner workload recommendations
-    exec_cols = [col for col in available_columns if any(term in col.lower() for term in ['executive', 'exective', 'owner'])]
+    exec_cols = column_roles(tuple(available_columns))["executive"]
     if exec_cols:
         exec_col = exec_cols[0]
         exec_workload = data[exec_col].value_counts()
@@ -919,15 +993,15 @@ def generate_recommendations(data, available_columns):
                 recommendations += f"   - Consider transferring 1-2 projects for better balance\n\n"
                 
                 # Create workload visualization
-                fig = px.bar(x=exec_workload.index, y=exec_workload.values,
+                fig = _px().bar(x=exec_workload.index, y=exec_workload.values,
                            title="Executive Workload Distribution",
                            labels={'x': exec_col, 'y': 'Number of Projects'})
     
     # Customer health recommendations
-    health_cols = [col for col in available_columns if 'health' in col.lower()]
+    health_cols = column_roles(tuple(available_columns))["health"]
     if health_cols:
         health_col = health_cols[0]
-        poor_health = sum(data[health_col].isin(['Red', 'Poor', 'At Risk']))
+        poor_health = int(data[health_col].isin(['Red', 'Poor', 'At Risk']).sum())
         
         if poor_health > 0:
             rec_count += 1
@@ -952,8 +1026,8 @@ def analyze_performance(data, available_columns, question):
     fig = None
     
     # Executive performance
-    if any(term in question for term in ['executive', 'exec', 'owner']):
-        exec_cols = [col for col in available_columns if any(term in col.lower() for term in ['executive', 'exective', 'owner'])]
+    if EXECUTIVE_TERMS_RE.search(question):
+        exec_cols = column_roles(tuple(available_columns))["executive"]
         if exec_cols:
             exec_col = exec_cols[0]
             exec_counts = data[exec_col].value_counts()
@@ -963,36 +1037,39 @@ def analyze_performance(data, available_columns, question):
             performance += f"- Least active: {exec_counts.index[-1]} ({exec_counts.iloc[-1]} projects)\n\n"
             
             # Success rate by executive if status available
-            status_cols = [col for col in available_columns if 'status' in col.lower()]
+            status_cols = column_roles(tuple(available_columns))["status"]
             if status_cols:
                 status_col = status_cols[0]
                 exec_performance = []
                 
+                # One mask and one groupby instead of slicing the frame per executive
+                green_by_exec = data[status_col].isin(['Green', 'G']).groupby(data[exec_col], observed=True).sum()
+                
                 for exec_name in exec_counts.index[:5]:  # Top 5 executives
-                    exec_data = data[data[exec_col] == exec_name]
-                    green_count = sum(exec_data[status_col].isin(['Green', 'G']))
-                    total_count = len(exec_data)
+                    green_count = int(green_by_exec.get(exec_name, 0))
+                    total_count = int(exec_counts[exec_name])
                     success_rate = (green_count / total_count) * 100 if total_count > 0 else 0
                     exec_performance.append({'Executive': exec_name, 'Success Rate': success_rate, 'Total Projects': total_count})
                 
                 perf_df = pd.DataFrame(exec_performance)
                 if not perf_df.empty:
-                    fig = px.bar(perf_df, x='Executive', y='Success Rate', 
+                    fig = _px().bar(perf_df, x='Executive', y='Success Rate', 
                                title="Executive Success Rate (% Green Status)",
                                hover_data=['Total Projects'])
     
     # Customer performance
-    elif any(term in question for term in ['customer', 'client']):
-        customer_cols = [col for col in available_columns if 'customer' in col.lower()]
+    elif CUSTOMER_TERMS_RE.search(question):
+        customer_cols = column_roles(tuple(available_columns))["customer"]
         if customer_cols:
             customer_col = customer_cols[0]
             customer_counts = data[customer_col].value_counts().head(10)
             
             performance += f"**Top Customers by Project Volume:**\n"
-            for i, (customer, count) in enumerate(customer_counts.items(), 1):
-                performance += f"{i}. {customer}: {count} projects\n"
+            ranks = pd.RangeIndex(1, len(customer_counts) + 1).astype(str)
+            lines = ranks + ". " + customer_counts.index.astype(str) + ": " + customer_counts.astype(str).to_numpy() + " projects\n"
+            performance += "".join(lines)
             
-            fig = px.bar(x=customer_counts.values, y=customer_counts.index, 
+            fig = _px().bar(x=customer_counts.values, y=customer_counts.index, 
                        orientation='h', title="Top 10 Customers by Project Count")
     
     return performance, fig
@@ -1009,14 +1086,13 @@ def analyze_trends(data, date_columns, numeric_columns, question):
     date_col = date_columns[0]
     
     # Revenue trends
-    if any(term in question for term in ['revenue', 'financial', 'money']):
-        revenue_cols = [col for col in numeric_columns if 'revenue' in col.lower()]
+    if REVENUE_TERMS_RE.search(question):
+        revenue_cols = column_roles(tuple(numeric_columns))["revenue"]
         if revenue_cols:
             revenue_col = revenue_cols[0]
-            monthly_revenue = data.groupby(data[date_col].dt.to_period('M'))[revenue_col].sum().reset_index()
-            monthly_revenue[date_col] = monthly_revenue[date_col].dt.to_timestamp()
+            monthly_revenue = data.groupby(month_start(data[date_col]))[revenue_col].sum().reset_index()
             
-            fig = px.line(monthly_revenue, x=date_col, y=revenue_col, 
+            fig = _px().line(monthly_revenue, x=date_col, y=revenue_col, 
                          title="Revenue Trend Over Time", markers=True)
             
             trends += f"**Revenue Trends:**\n"
@@ -1029,10 +1105,9 @@ def analyze_trends(data, date_columns, numeric_columns, question):
     
     # Project trends
     else:
-        monthly_projects = data.groupby(data[date_col].dt.to_period('M')).size().reset_index(name='Project Count')
-        monthly_projects[date_col] = monthly_projects[date_col].dt.to_timestamp()
+        monthly_projects = data.groupby(month_start(data[date_col])).size().reset_index(name='Project Count')
         
-        fig = px.line(monthly_projects, x=date_col, y='Project Count', 
+        fig = _px().line(monthly_projects, x=date_col, y='Project Count', 
                      title="Project Volume Trend Over Time", markers=True)
         
         trends += f"**Project Volume Trends:**\n"
@@ -1045,6 +1120,27 @@ def analyze_trends(data, date_columns, numeric_columns, question):
     
     return trends, fig
 
+# Keyword intents for analyze_data_locally, checked in order (first match wins).
+# Handlers receive (data, question_lower, available, numeric, categorical, date columns)
+LOCAL_ANALYSIS_INTENTS = (
+    (keyword_pattern("ai", "llm", "free ai", "artificial intelligence", "machine learning"),
+     describe_ai_features),
+    (keyword_pattern("comprehensive", "full analysis", "overview", "summary", "insights"),
+     lambda data, q, cols, num, cat, dates: generate_comprehensive_analysis(data, cols, num, cat)),
+    (keyword_pattern("risk", "issue", "problem", "concern", "alert"),
+     lambda data, q, cols, num, cat, dates: identify_risks_and_issues(data, cols)),
+    (keyword_pattern("recommend", "action", "should do", "next steps", "improve"),
+     lambda data, q, cols, num, cat, dates: generate_recommendations(data, cols)),
+    (keyword_pattern("performance", "performing", "best", "worst", "top", "bottom"),
+     lambda data, q, cols, num, cat, dates: analyze_performance(data, cols, q)),
+    (keyword_pattern("trend", "pattern", "over time", "timeline", "historical"),
+     lambda data, q, cols, num, cat, dates: analyze_trends(data, dates, num, q)),
+)
+
+# Every intent keyword in one alternation, so a question matching none of them
+# costs a single scan before falling through to the original analysis
+LOCAL_ANALYSIS_ANY_RE = re.compile("|".join(pattern.pattern for pattern, _ in LOCAL_ANALYSIS_INTENTS))
+
 def analyze_data_for_chat_original(question, data):
     """Original analyze function for backward compatibility"""
     question_lower = question.lower().strip()
@@ -1055,25 +1151,24 @@ def analyze_data_for_chat_original(question, data):
             return "I need data to answer questions. Please load or adjust filters on other pages.", None
             
         # Get available columns and their data types for dynamic analysis
-        available_columns = list(data.columns)
-        numeric_columns = data.select_dtypes(include=['int64', 'float64']).columns.tolist()
-        categorical_columns = data.select_dtypes(include=['object', 'category']).columns.tolist()
-        date_columns = data.select_dtypes(include=['datetime64']).columns.tolist()
+        available_columns, numeric_columns, categorical_columns, date_columns = split_columns_by_type(data)
         
         # Handle basic greetings and help
-        if any(greeting in question_lower for greeting in ["hello", "hi", "hey", "help", "what can you do"]):
+        if GREETING_RE.search(question_lower):
             column_info = f"Your data has {len(available_columns)} columns including: {', '.join(available_columns[:5])}"
             if len(available_columns) > 5:
                 column_info += f" and {len(available_columns) - 5} more."
             
+            numeric_lowered = lowered_column_names(tuple(numeric_columns))
+            categorical_lowered = lowered_column_names(tuple(categorical_columns))
             suggestions = "Try asking about:\n"
-            if "revenue" in numeric_columns or any("revenue" in col.lower() for col in numeric_columns):
+            if any("revenue" in col for col in numeric_lowered):
                 suggestions += "- Revenue analysis\n"
-            if "customer" in categorical_columns or any("customer" in col.lower() for col in categorical_columns):
+            if any("customer" in col for col in categorical_lowered):
                 suggestions += "- Customer information\n"
-            if "project" in categorical_columns or any("project" in col.lower() for col in categorical_columns):
+            if any("project" in col for col in categorical_lowered):
                 suggestions += "- Project statistics\n"
-            if "status" in categorical_columns or any("status" in col.lower() for col in categorical_columns):
+            if any("status" in col for col in categorical_lowered):
                 suggestions += "- Status distributions\n"
             if date_columns:
                 suggestions += "- Time-based trends\n"
@@ -1083,7 +1178,7 @@ def analyze_data_for_chat_original(question, data):
             return f"Hello! I can analyze your data based on the columns available.\n\n{column_info}\n\n{suggestions}", None
             
         # Handle column discovery requests
-        if any(phrase in question_lower for phrase in ["what columns", "available columns", "what data", "show columns", "list columns"]):
+        if COLUMN_LIST_RE.search(question_lower):
             col_types = {
                 "Numeric": numeric_columns,
                 "Categorical": categorical_columns,
@@ -1098,18 +1193,14 @@ def analyze_data_for_chat_original(question, data):
             return response, None
         
         # Handle summary statistics request
-        if "summary" in question_lower or "statistics" in question_lower or "describe" in question_lower:
+        if SUMMARY_RE.search(question_lower):
             # Find specific column matches
-            col_match = None
-            for col in available_columns:
-                if col.lower() in question_lower:
-                    col_match = col
-                    break
+            col_match = mentioned_column(available_columns, question_lower)
             
             if col_match:
                 if col_match in numeric_columns:
                     stats = data[col_match].describe().to_dict()
-                    fig = px.box(data, y=col_match, title=f"Distribution of {col_match}")
+                    fig = _px().box(data, y=col_match, title=f"Distribution of {col_match}")
                     return f"**Summary statistics for {col_match}:**\n" + \
                            f"Count: {stats['count']:.0f}\n" + \
                            f"Mean: {stats['mean']:.2f}\n" + \
@@ -1121,53 +1212,56 @@ def analyze_data_for_chat_original(question, data):
                            f"Max: {stats['max']:.2f}", fig
                 elif col_match in categorical_columns:
                     value_counts = data[col_match].value_counts()
-                    fig = px.pie(values=value_counts.values, names=value_counts.index, 
-                               title=f"Distribution of {col_match}")
-                    value_summary = "\n".join([f"- {val}: {count}" for val, count in value_counts.items()])
+                    fig = counts_pie(value_counts, f"Distribution of {col_match}")
+                    lines = "- " + value_counts.index.astype(str) + ": " + value_counts.astype(str).to_numpy()
+                    value_summary = "\n".join(lines)
                     return f"**Value counts for {col_match}:**\n\n{value_summary}", fig
             else:
                 # General summary
+                # Returned as a table for st.dataframe rather than rendered into the text
                 numeric_summary = data[numeric_columns].describe().transpose()
-                return f"**Dataset Summary:**\nTotal rows: {len(data)}\nTotal columns: {len(available_columns)}\n\n{numeric_summary.to_string()}", None
+                return f"**Dataset Summary:**\nTotal rows: {len(data)}\nTotal columns: {len(available_columns)}", numeric_summary
         
         # Count queries for projects by status
-        if re.search(r"how many projects (?:have|are)(?: project)? status(?: as| is| =)? (red|green|yellow|amber|r\b|g\b|y\b|a\b)", question_lower):
-            color_match = re.search(r"status(?:.*?)(red|green|yellow|amber|r\b|g\b|y\b|a\b)", question_lower)
-            if color_match:
-                status_color = color_match.group(1).lower().strip()
-                
-                # Find the status column
-                status_cols = [col for col in categorical_columns if "status" in col.lower()]
-                if not status_cols:
-                    return "No status column found in the data.", None
-                
-                status_col = status_cols[0]
-                
-                # Map colors to possible values
-                if status_color in ["red", "r"]:
-                    possible_values = ["Red", "R"]
-                    display_color = "Red"
-                elif status_color in ["green", "g"]:
-                    possible_values = ["Green", "G"]
-                    display_color = "Green"
-                elif status_color in ["yellow", "y", "amber", "a"]:
-                    possible_values = ["Yellow", "Y", "Amber", "A"]
-                    display_color = "Yellow/Amber"
-                
-                # Count matches
-                count = 0
-                matched_values = []
-                for val in possible_values:
-                    val_count = data[data[status_col] == val].shape[0]
-                    if val_count > 0:
-                        count += val_count
-                        matched_values.append(f"{val}: {val_count}")
-                
-                response = f"**There are {count} projects with {display_color} status.**"
-                if len(matched_values) > 0:
-                    response += f"\n\nBreakdown: {', '.join(matched_values)}"
-                
-                return response, None
+        # A single scan recognises the question and captures the colour; the
+        # literal pretest keeps the regex engine off unrelated questions
+        color_match = "how many" in question_lower and STATUS_COUNT_QUESTION_RE.search(question_lower)
+        if color_match:
+            status_color = color_match.group("color")
+            
+            # Find the status column
+            status_cols = column_roles(tuple(categorical_columns))["status"]
+            if not status_cols:
+                return "No status column found in the data.", None
+            
+            status_col = status_cols[0]
+            
+            # Map colors to possible values
+            if status_color in ["red", "r"]:
+                possible_values = ["Red", "R"]
+                display_color = "Red"
+            elif status_color in ["green", "g"]:
+                possible_values = ["Green", "G"]
+                display_color = "Green"
+            elif status_color in ["yellow", "y", "amber", "a"]:
+                possible_values = ["Yellow", "Y", "Amber", "A"]
+                display_color = "Yellow/Amber"
+            
+            # Count matches from a single pass over the status column
+            status_counts = data[status_col].value_counts()
+            count = 0
+            matched_values = []
+            for val in possible_values:
+                val_count = int(status_counts.get(val, 0))
+                if val_count > 0:
+                    count += val_count
+                    matched_values.append(f"{val}: {val_count}")
+            
+            response = f"**There are {count} projects with {display_color} status.**"
+            if len(matched_values) > 0:
+                response += f"\n\nBreakdown: {', '.join(matched_values)}"
+            
+            return response, None
         
         # If we've reached this point, provide a helpful response
         column_suggestions = ""
@@ -1196,10 +1290,14 @@ def display_faq(current_data):
     """Display frequently asked questions"""
     faq_items = {}
     if not current_data.empty:
+        # One value_counts gives the busiest executive (ties resolved like mode) and its count
+        exec_counts = current_data['Exective'].value_counts(sort=False) if 'Exective' in current_data else pd.Series(dtype="int64")
+        top_exec_count = exec_counts.max() if exec_counts.any() else 0
+        top_exec = first_in_value_order(exec_counts.index[exec_counts == top_exec_count]) if top_exec_count else None
         faq_items = {
             "What is the total revenue?": f"The total revenue in the current filtered data is ${current_data['Revenue'].sum():,.0f}." if 'Revenue' in current_data else "Revenue data not available.",
             "How many projects are there in total?": f"There are {current_data.shape[0]} projects in the current filtered data.",
-            "Which executive has the most projects?": (f"The executive with the most projects is {current_data['Exective'].mode()[0]} with {current_data['Exective'].value_counts().max()} projects." if 'Exective' in current_data and not current_data['Exective'].dropna().empty and len(current_data['Exective'].mode()) > 0 else "Executive data not available or insufficient."),
+            "Which executive has the most projects?": (f"The executive with the most projects is {top_exec} with {top_exec_count} projects." if top_exec_count else "Executive data not available or insufficient."),
             "What are the different project statuses?": (f"The project statuses are: {', '.join([str(x) for x in current_data['Project Status (R/G/Y)'].unique() if pd.notna(x)])}." if 'Project Status (R/G/Y)' in current_data else "Project status data not available.")
         }
     else:
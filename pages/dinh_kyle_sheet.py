@@ -1,7 +1,7 @@
 import streamlit as st
-import pandas as pd
 import streamlit.components.v1 as components
 import os
+from utils.data_loader import read_local_excel
 
 def show_page():
     """Display the Dinh and Kyle Sheet page"""
@@ -49,11 +49,7 @@ def load_may_revenue_excel():
         excel_file_path = os.path.join(os.path.dirname(__file__), "..", "May'25 Revenue.xlsx")
         if os.path.exists(excel_file_path):
             # Load all sheets
-            excel_data = {}
-            with pd.ExcelFile(excel_file_path) as xls:
-                for sheet_name in xls.sheet_names:
-                    excel_data[sheet_name] = pd.read_excel(excel_file_path, sheet_name=sheet_name)
-            return excel_data
+            return read_local_excel(excel_file_path, os.path.getmtime(excel_file_path))
         else:
             st.warning(f"Excel file 'May'25 Revenue.xlsx' not found in {os.path.dirname(excel_file_path)}")
             return None
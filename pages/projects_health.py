@@ -2,7 +2,9 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 import os
+from utils.data_loader import filter_options
 
 def show_page(current_display_df):
     """Display the Projects & Customer Health page"""
@@ -61,11 +63,10 @@ def display_key_metrics(current_display_df):
     st.markdown("## 📝 Data Overview & Key Insights")
     
     # Calculate summary statistics
-    total_projects_sum = current_display_df.shape[0]
-    total_churned_sum = int(pd.to_numeric(current_display_df['Churn'], errors='coerce').fillna(0).sum()) if "Churn" in current_display_df.columns else 0
+    total_projects_sum, total_churned_sum, unique_customers, total_usecases = key_metric_totals(
+        filtered_data_version(), current_display_df
+    )
     churn_rate = (total_churned_sum / total_projects_sum) * 100 if total_projects_sum > 0 else 0
-    unique_customers = current_display_df["Customer Name"].nunique() if "Customer Name" in current_display_df.columns else 0
-    total_usecases = current_display_df["Total Usecases/Module"].sum() if "Total Usecases/Module" in current_display_df.columns else 0
     
     # Create metric cards
     metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
@@ -158,149 +159,165 @@ def display_client_details(current_display_df):
     
     if exec_col and status_col and "Customer Name" in current_display_df.columns:
         client_col1, client_col2 = st.columns(2)
-        executives = sorted(current_display_df[exec_col].unique())
-        
+        executives = filter_options(current_display_df[exec_col])
+
+        # Client names for every (executive, status) pair from one groupby pass
+        clients_by_exec_status = {}
+        for (exec_name, status), clients_text in names_by_group(filtered_data_version(), current_display_df, [exec_col, status_col]).items():
+            clients_by_exec_status.setdefault(exec_name, {})[status] = clients_text
+
         for i, exec_name in enumerate(executives):
             if pd.notna(exec_name):
-                exec_data = current_display_df[current_display_df[exec_col] == exec_name]
-                
+                status_clients = clients_by_exec_status.get(exec_name, {})
+
                 with client_col1 if i % 2 == 0 else client_col2:
                     st.markdown(f"**👤 {exec_name}**")
-                    
-                    for status in sorted(exec_data[status_col].unique()):
-                        if pd.notna(status):
-                            status_data = exec_data[exec_data[status_col] == status]
-                            if not status_data.empty:
-                                client_list = status_data["Customer Name"].value_counts()
-                                
-                                if status in ["Green", "G"]:
-                                    status_emoji = "🟢"
-                                elif status in ["Yellow", "Y", "Amber", "A"]:
-                                    status_emoji = "🟡"
-                                elif status in ["Red", "R"]:
-                                    status_emoji = "🔴"
-                                else:
-                                    status_emoji = "⚪"
-                                
-                                st.markdown(f"&nbsp;&nbsp;{status_emoji} **{status}:** {', '.join(client_list.index)}")
+
+                    for status in sorted(status_clients):
+                        if status in ["Green", "G"]:
+                            status_emoji = "🟢"
+                        elif status in ["Yellow", "Y", "Amber", "A"]:
+                            status_emoji = "🟡"
+                        elif status in ["Red", "R"]:
+                            status_emoji = "🔴"
+                        else:
+                            status_emoji = "⚪"
+
+                        st.markdown(f"&nbsp;&nbsp;{status_emoji} **{status}:** {status_clients[status]}")
                     
                     st.markdown("")
     else:
         st.info("Client details require Executive and Status columns to be available.")
 
+# Location coordinates mapping
+LOCATION_COORDS = {
+    'USA': {'lat': 39.8283, 'lon': -98.5795, 'country': 'United States'},
+    'United States': {'lat': 39.8283, 'lon': -98.5795, 'country': 'United States'},
+    'Houston, Texas': {'lat': 29.7604, 'lon': -95.3698, 'country': 'United States'},
+    'Austin': {'lat': 30.2672, 'lon': -97.7431, 'country': 'United States'},
+    'Texas': {'lat': 31.9686, 'lon': -99.9018, 'country': 'United States'},
+    'Canada': {'lat': 56.1304, 'lon': -106.3468, 'country': 'Canada'},
+    'Mumbai, India': {'lat': 19.0760, 'lon': 72.8777, 'country': 'India'},
+    'Navi Mumbai': {'lat': 19.0330, 'lon': 73.0297, 'country': 'India'},
+    'Chennai': {'lat': 13.0827, 'lon': 80.2707, 'country': 'India'},
+    'Kolkata': {'lat': 22.5726, 'lon': 88.3639, 'country': 'India'},
+    'Gujarat': {'lat': 23.0225, 'lon': 72.5714, 'country': 'India'},
+    'Odissa': {'lat': 20.9517, 'lon': 85.0985, 'country': 'India'},
+    'Pakistan': {'lat': 30.3753, 'lon': 69.3451, 'country': 'Pakistan'},
+    'Saudi Arabia': {'lat': 23.8859, 'lon': 45.0792, 'country': 'Saudi Arabia'},
+    'Singapore': {'lat': 1.3521, 'lon': 103.8198, 'country': 'Singapore'},
+    'Austrialla': {'lat': -25.2744, 'lon': 133.7751, 'country': 'Australia'},
+    'Australia': {'lat': -25.2744, 'lon': 133.7751, 'country': 'Australia'},
+    'Ireland': {'lat': 53.1424, 'lon': -7.6921, 'country': 'Ireland'},
+    'Finland': {'lat': 61.9241, 'lon': 25.7482, 'country': 'Finland'},
+    'Colombia': {'lat': 4.5709, 'lon': -74.2973, 'country': 'Colombia'},
+    'EU': {'lat': 54.5260, 'lon': 15.2551, 'country': 'Europe'},
+    'NAM': {'lat': 45.0000, 'lon': -100.0000, 'country': 'North America'},
+    'APAC': {'lat': 35.0000, 'lon': 105.0000, 'country': 'Asia Pacific'},
+    'MEA': {'lat': 26.0667, 'lon': 50.5577, 'country': 'Middle East & Africa'},
+    'LATAM': {'lat': -8.7832, 'lon': -55.4915, 'country': 'Latin America'}
+}
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def summarize_locations(data_version, _df, location_col):
+    """Per-location project, customer and status summary for the world map"""
+    # Keyed on the data version from apply_filters; _df itself is not hashed
+    map_data = []
+    status_col = get_status_column(_df)
+    
+    # Match locations against the coordinate table in one vectorized pass, then
+    # split the known rows by location once instead of masking per location
+    locations = _df[location_col].astype(str).str.strip()
+    known = _df[location_col].notna() & locations.isin(list(LOCATION_COORDS))
+    for location_str, location_data in _df[known].groupby(locations[known], sort=False):
+        project_count = len(location_data)
+        customer_count = location_data["Customer Name"].nunique() if "Customer Name" in location_data.columns else 0
+        
+        customers = location_data["Customer Name"].unique() if "Customer Name" in location_data.columns else []
+        customer_list = ", ".join(customers[:5])
+        if len(customers) > 5:
+            customer_list += f" and {len(customers) - 5} more"
+        
+        status_info = ""
+        if status_col and not location_data[status_col].empty:
+            status_counts = present_value_counts(location_data[status_col])
+            status_info = " | ".join(status_counts.index.astype(str) + ": " + status_counts.astype(str).to_numpy())
+        
+        map_data.append({
+            'location': location_str,
+            'lat': LOCATION_COORDS[location_str]['lat'],
+            'lon': LOCATION_COORDS[location_str]['lon'],
+            'country': LOCATION_COORDS[location_str]['country'],
+            'projects': project_count,
+            'customers': customer_count,
+            'customer_list': customer_list,
+            'status_info': status_info,
+            'size': min(project_count * 10, 100)
+        })
+    return map_data
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def world_map_figure(data_version, _df, location_col):
+    """Bubble map of projects per known location"""
+    map_df = pd.DataFrame(summarize_locations(data_version, _df, location_col))
+    
+    fig_map = px.scatter_geo(
+        map_df,
+        lat='lat',
+        lon='lon',
+        size='projects',
+        color='projects',
+        hover_name='location',
+        hover_data={
+            'country': True,
+            'projects': True,
+            'customers': True,
+            'customer_list': True,
+            'status_info': True,
+            'lat': False,
+            'lon': False
+        },
+        color_continuous_scale='Viridis',
+        size_max=50,
+        title="🌍 Global Project Distribution"
+    )
+    
+    fig_map.update_traces(
+        marker=dict(line=dict(width=2, color='white'), opacity=0.8),
+        hovertemplate="<b>%{hovertext}</b><br>" +
+                      "Country: %{customdata[0]}<br>" +
+                      "Projects: %{customdata[1]}<br>" +
+                      "Customers: %{customdata[2]}<br>" +
+                      "Customer List: %{customdata[3]}<br>" +
+                      "Status: %{customdata[4]}<br>" +
+                      "<extra></extra>"
+    )
+    
+    fig_map.update_layout(
+        title={'text': "🌍 Global Project Distribution", 'x': 0.5, 'xanchor': 'center'},
+        height=650,
+        geo=dict(
+            showframe=False, showcoastlines=True, coastlinecolor="#2E86AB",
+            coastlinewidth=2, showland=True, landcolor='#F8F9FA',
+            showocean=True, oceancolor='#E3F2FD', showlakes=True,
+            lakecolor='#E3F2FD', projection_type='natural earth', bgcolor='white'
+        )
+    )
+    
+    return fig_map
+
 def display_world_map(current_display_df):
     """Display interactive world map"""
     if "Geography - Location" in current_display_df.columns or "Geography" in current_display_df.columns:
         st.subheader("🌍 Interactive World Map - Global Project Distribution")
         
-        # Location coordinates mapping
-        location_coords = {
-            'USA': {'lat': 39.8283, 'lon': -98.5795, 'country': 'United States'},
-            'United States': {'lat': 39.8283, 'lon': -98.5795, 'country': 'United States'},
-            'Houston, Texas': {'lat': 29.7604, 'lon': -95.3698, 'country': 'United States'},
-            'Austin': {'lat': 30.2672, 'lon': -97.7431, 'country': 'United States'},
-            'Texas': {'lat': 31.9686, 'lon': -99.9018, 'country': 'United States'},
-            'Canada': {'lat': 56.1304, 'lon': -106.3468, 'country': 'Canada'},
-            'Mumbai, India': {'lat': 19.0760, 'lon': 72.8777, 'country': 'India'},
-            'Navi Mumbai': {'lat': 19.0330, 'lon': 73.0297, 'country': 'India'},
-            'Chennai': {'lat': 13.0827, 'lon': 80.2707, 'country': 'India'},
-            'Kolkata': {'lat': 22.5726, 'lon': 88.3639, 'country': 'India'},
-            'Gujarat': {'lat': 23.0225, 'lon': 72.5714, 'country': 'India'},
-            'Odissa': {'lat': 20.9517, 'lon': 85.0985, 'country': 'India'},
-            'Pakistan': {'lat': 30.3753, 'lon': 69.3451, 'country': 'Pakistan'},
-            'Saudi Arabia': {'lat': 23.8859, 'lon': 45.0792, 'country': 'Saudi Arabia'},
-            'Singapore': {'lat': 1.3521, 'lon': 103.8198, 'country': 'Singapore'},
-            'Austrialla': {'lat': -25.2744, 'lon': 133.7751, 'country': 'Australia'},
-            'Australia': {'lat': -25.2744, 'lon': 133.7751, 'country': 'Australia'},
-            'Ireland': {'lat': 53.1424, 'lon': -7.6921, 'country': 'Ireland'},
-            'Finland': {'lat': 61.9241, 'lon': 25.7482, 'country': 'Finland'},
-            'Colombia': {'lat': 4.5709, 'lon': -74.2973, 'country': 'Colombia'},
-            'EU': {'lat': 54.5260, 'lon': 15.2551, 'country': 'Europe'},
-            'NAM': {'lat': 45.0000, 'lon': -100.0000, 'country': 'North America'},
-            'APAC': {'lat': 35.0000, 'lon': 105.0000, 'country': 'Asia Pacific'},
-            'MEA': {'lat': 26.0667, 'lon': 50.5577, 'country': 'Middle East & Africa'},
-            'LATAM': {'lat': -8.7832, 'lon': -55.4915, 'country': 'Latin America'}
-        }
-        
-        # Prepare map data
-        map_data = []
         location_col = "Geography - Location" if "Geography - Location" in current_display_df.columns else "Geography"
-        
-        for location in current_display_df[location_col].dropna().unique():
-            location_str = str(location).strip()
-            if location_str in location_coords:
-                location_data = current_display_df[current_display_df[location_col] == location]
-                project_count = len(location_data)
-                customer_count = location_data["Customer Name"].nunique() if "Customer Name" in location_data.columns else 0
-                
-                customers = location_data["Customer Name"].unique() if "Customer Name" in location_data.columns else []
-                customer_list = ", ".join(customers[:5])
-                if len(customers) > 5:
-                    customer_list += f" and {len(customers) - 5} more"
-                
-                status_col = get_status_column(current_display_df)
-                status_info = ""
-                if status_col and not location_data[status_col].empty:
-                    status_counts = location_data[status_col].value_counts()
-                    status_info = " | ".join([f"{status}: {count}" for status, count in status_counts.items()])
-                
-                map_data.append({
-                    'location': location_str,
-                    'lat': location_coords[location_str]['lat'],
-                    'lon': location_coords[location_str]['lon'],
-                    'country': location_coords[location_str]['country'],
-                    'projects': project_count,
-                    'customers': customer_count,
-                    'customer_list': customer_list,
-                    'status_info': status_info,
-                    'size': min(project_count * 10, 100)
-                })
+        map_data = summarize_locations(filtered_data_version(), current_display_df, location_col)
         
         if map_data:
             map_df = pd.DataFrame(map_data)
             
-            fig_map = px.scatter_geo(
-                map_df,
-                lat='lat',
-                lon='lon',
-                size='projects',
-                color='projects',
-                hover_name='location',
-                hover_data={
-                    'country': True,
-                    'projects': True,
-                    'customers': True,
-                    'customer_list': True,
-                    'status_info': True,
-                    'lat': False,
-                    'lon': False
-                },
-                color_continuous_scale='Viridis',
-                size_max=50,
-                title="🌍 Global Project Distribution"
-            )
-            
-            fig_map.update_traces(
-                marker=dict(line=dict(width=2, color='white'), opacity=0.8),
-                hovertemplate="<b>%{hovertext}</b><br>" +
-                              "Country: %{customdata[0]}<br>" +
-                              "Projects: %{customdata[1]}<br>" +
-                              "Customers: %{customdata[2]}<br>" +
-                              "Customer List: %{customdata[3]}<br>" +
-                              "Status: %{customdata[4]}<br>" +
-                              "<extra></extra>"
-            )
-            
-            fig_map.update_layout(
-                title={'text': "🌍 Global Project Distribution", 'x': 0.5, 'xanchor': 'center'},
-                height=650,
-                geo=dict(
-                    showframe=False, showcoastlines=True, coastlinecolor="#2E86AB",
-                    coastlinewidth=2, showland=True, landcolor='#F8F9FA',
-                    showocean=True, oceancolor='#E3F2FD', showlakes=True,
-                    lakecolor='#E3F2FD', projection_type='natural earth', bgcolor='white'
-                )
-            )
+            fig_map = world_map_figure(filtered_data_version(), current_display_df, location_col)
             
             st.plotly_chart(fig_map, use_container_width=True)
             
@@ -317,7 +334,7 @@ def display_world_map(current_display_df):
                 st.metric("Top Location", top_location)
             
             with st.expander("📍 View Detailed Location Breakdown"):
-                display_df = map_df[['location', 'country', 'projects', 'customers', 'customer_list']].copy()
+                display_df = map_df[['location', 'country', 'projects', 'customers', 'customer_list']]
                 display_df.columns = ['Location', 'Country/Region', 'Projects', 'Customers', 'Customer Names']
                 display_df = display_df.sort_values('Projects', ascending=False)
                 st.dataframe(display_df, use_container_width=True)
@@ -329,11 +346,7 @@ def display_geography_analysis(current_display_df):
     if "Geography" in current_display_df.columns:
         st.subheader("Clients by Geography")
         
-        geo_clients = current_display_df.groupby("Geography")["Customer Name"].apply(
-            lambda x: list(x.unique())
-        ).reset_index()
-        geo_clients["Client_Count"] = geo_clients["Customer Name"].apply(len)
-        geo_clients["Client_Names"] = geo_clients["Customer Name"].apply(lambda x: ", ".join(x))
+        geo_clients = clients_by_geography(filtered_data_version(), current_display_df)
         
         if not geo_clients.empty:
             fig_geo_clients = px.bar(
@@ -356,9 +369,11 @@ def display_geography_analysis(current_display_df):
             st.plotly_chart(fig_geo_clients, use_container_width=True)
             
             with st.expander("View Client Details by Geography"):
-                for _, row in geo_clients.iterrows():
-                    st.write(f"**{row['Geography']}** ({row['Client_Count']} clients):")
-                    st.write(f"  {row['Client_Names']}")
+                for geography, client_count, client_names in zip(
+                    geo_clients["Geography"], geo_clients["Client_Count"], geo_clients["Client_Names"]
+                ):
+                    st.write(f"**{geography}** ({client_count} clients):")
+                    st.write(f"  {client_names}")
                     st.write("")
 
 def display_status_and_health_analysis(current_display_df, status_color_map):
@@ -371,7 +386,7 @@ def display_status_and_health_analysis(current_display_df, status_color_map):
         
         if status_col and not current_display_df[status_col].empty:
             st.subheader("Project Status Distribution")
-            status_counts_df = current_display_df[status_col].value_counts().reset_index()
+            status_counts_df = value_counts_frame(filtered_data_version(), current_display_df, status_col)
             status_counts_df.columns = ['Status', 'Count']
             
             fig_status_pie = px.pie(
@@ -400,28 +415,20 @@ def display_status_and_health_analysis(current_display_df, status_color_map):
         
         if health_col and not current_display_df[health_col].empty:
             st.subheader("Customer Health Distribution")
-            health_counts = current_display_df[health_col].value_counts().reset_index()
+            health_counts = value_counts_frame(filtered_data_version(), current_display_df, health_col)
             health_counts.columns = ["Health", "Count"]
             
             if not health_counts.empty:
                 # Add detailed information for hover
+                exec_col = get_executive_column(current_display_df)
+                has_clients = "Customer Name" in current_display_df.columns
+                clients_by_health = names_by_group(filtered_data_version(), current_display_df, health_col) if has_clients else {}
+                executives_by_health = names_by_group(filtered_data_version(), current_display_df, health_col, exec_col) if exec_col else {}
+
                 health_details = []
                 for health_status in health_counts["Health"]:
-                    health_data = current_display_df[current_display_df[health_col] == health_status]
-                    
-                    if "Customer Name" in current_display_df.columns:
-                        client_list = health_data["Customer Name"].value_counts()
-                        clients_text = ", ".join(client_list.index)
-                    else:
-                        clients_text = "No client data"
-                    
-                    exec_col = get_executive_column(current_display_df)
-                    if exec_col:
-                        exec_list = health_data[exec_col].value_counts()
-                        executives_text = ", ".join(exec_list.index)
-                    else:
-                        executives_text = "No executive data"
-                    
+                    clients_text = clients_by_health.get(health_status, "") if has_clients else "No client data"
+                    executives_text = executives_by_health.get(health_status, "") if exec_col else "No executive data"
                     health_details.append({"clients": clients_text, "executives": executives_text})
                 
                 health_counts["Clients"] = [detail["clients"] for detail in health_details]
@@ -463,20 +470,16 @@ def display_executive_analysis(current_display_df, status_color_map):
     with viz_row2_col1:
         exec_col = get_executive_column(current_display_df)
         if exec_col:
-            exec_counts = current_display_df[exec_col].value_counts().reset_index()
+            exec_counts = value_counts_frame(filtered_data_version(), current_display_df, exec_col)
             exec_counts.columns = [exec_col, "Count"]
             
             if not exec_counts.empty:
                 # Add client information for hover
-                exec_clients = []
-                for exec_name in exec_counts[exec_col]:
-                    exec_data = current_display_df[current_display_df[exec_col] == exec_name]
-                    if "Customer Name" in current_display_df.columns:
-                        client_list = exec_data["Customer Name"].value_counts()
-                        all_clients = ", ".join(client_list.index)
-                        exec_clients.append(all_clients)
-                    else:
-                        exec_clients.append("No client data")
+                if "Customer Name" in current_display_df.columns:
+                    clients_by_exec = names_by_group(filtered_data_version(), current_display_df, exec_col)
+                    exec_clients = [clients_by_exec.get(exec_name, "") for exec_name in exec_counts[exec_col]]
+                else:
+                    exec_clients = ["No client data"] * len(exec_counts)
                 
                 exec_counts["Clients"] = exec_clients
                 
@@ -497,24 +500,18 @@ def display_executive_analysis(current_display_df, status_color_map):
         status_col = get_status_column(current_display_df)
         
         if exec_col and status_col:
-            exec_status_counts = current_display_df.groupby([exec_col, status_col], observed=True).size().reset_index(name="Count")
+            exec_status_counts = group_sizes(filtered_data_version(), current_display_df, [exec_col, status_col])
             
             if not exec_status_counts.empty:
                 # Add client information for hover
-                exec_status_clients = []
-                for _, row in exec_status_counts.iterrows():
-                    exec_name = row[exec_col]
-                    status = row[status_col]
-                    filtered_data = current_display_df[
-                        (current_display_df[exec_col] == exec_name) & 
-                        (current_display_df[status_col] == status)
+                if "Customer Name" in current_display_df.columns:
+                    clients_by_exec_status = names_by_group(filtered_data_version(), current_display_df, [exec_col, status_col])
+                    exec_status_clients = [
+                        clients_by_exec_status.get(key, "No client data")
+                        for key in zip(exec_status_counts[exec_col], exec_status_counts[status_col])
                     ]
-                    if "Customer Name" in current_display_df.columns and not filtered_data.empty:
-                        client_list = filtered_data["Customer Name"].value_counts()
-                        all_clients = ", ".join(client_list.index)
-                        exec_status_clients.append(all_clients)
-                    else:
-                        exec_status_clients.append("No client data")
+                else:
+                    exec_status_clients = ["No client data"] * len(exec_status_counts)
                 
                 exec_status_counts["Clients"] = exec_status_clients
                 
@@ -532,100 +529,119 @@ def display_contract_analysis(current_display_df):
     if "Contract End Date" in current_display_df.columns and not current_display_df["Contract End Date"].isnull().all():
         st.subheader("Projects by Contract End Date")
         
-        contract_project_data = current_display_df[["Contract End Date", "Customer Name"]].dropna()
+        contract_trend_year = contract_year_counts(filtered_data_version(), current_display_df)
         
-        if not contract_project_data.empty:
-            contract_project_data["End_Year"] = contract_project_data["Contract End Date"].dt.year
-            contract_trend_year = contract_project_data.groupby(["End_Year", "Customer Name"]).size().reset_index(name="Project_Count")
-            
-            # Maximize pastel colors, then add patterns on top when cycling through
-            unique_customers = contract_trend_year["Customer Name"].unique()
-            num_customers = len(unique_customers)
-            
-            # Beautiful distinct pastel colors (optimized for 15 unique solids)
-            pastel_colors = [
-                '#FFB3BA',  # Light pink
-                '#BAFFC9',  # Light mint green  
-                '#BAE1FF',  # Light sky blue
-                '#FFFFBA',  # Light yellow
-                '#FFD1BA',  # Light peach
-                '#E1BAFF',  # Light lavender
-                '#FFBAF3',  # Light magenta
-                '#C9FFBA',  # Light lime
-                '#BABFFF',  # Light periwinkle
-                '#F3FFBA',  # Light cream
-                '#FFBAC9',  # Light coral
-                '#BAFFE1',  # Light aqua
-                '#D1BAFF',  # Light purple
-                '#FFF3BA',  # Light lemon
-                '#FFBAD1'   # Light rose
-            ]
-            
-            # Clean, professional patterns for when we cycle through colors
-            patterns = ["", ".", "/", "\\", "|", "+", "x"]  # Solid first, then patterns
-            
-            # Smart assignment: use all pastels first, then add patterns on top
-            customer_colors = {}
-            customer_patterns = {}
-            
-            for i, customer in enumerate(unique_customers):
-                # Assign pastel color (cycle through the full palette)
-                color_index = i % len(pastel_colors)
-                customer_colors[customer] = pastel_colors[color_index]
-                
-                # Assign pattern: solid for first 15, then patterns for 16+
-                if i < 15:
-                    # First 15 customers - all solid pastels
-                    customer_patterns[customer] = ""
-                else:
-                    # Customer 16+ - cycle through pastels with patterns
-                    pattern_round = (i - 15) // len(pastel_colors)
-                    pattern_index = (pattern_round % (len(patterns) - 1)) + 1  # Skip solid pattern ""
-                    customer_patterns[customer] = patterns[pattern_index]
-            
-            # Add pattern column to dataframe
-            contract_trend_year['Pattern'] = contract_trend_year['Customer Name'].map(customer_patterns)
-            
-            fig_contracts_stacked = px.bar(
-                contract_trend_year,
-                x="End_Year",
-                y="Project_Count", 
-                color="Customer Name",
-                pattern_shape="Pattern",
-                title="🎯 Projects by Contract End Date (Stacked)",
-                barmode="stack",
-                color_discrete_map=customer_colors
-            )
-            
-            # Enhanced styling: Keep pastel colors as background with visible patterns
-            fig_contracts_stacked.update_traces(
-                marker=dict(
-                    line=dict(color='white', width=2),  # White borders around all bars
-                    pattern=dict(
-                        fillmode='overlay',  # Overlay pattern on pastel color
-                        fgcolor='rgba(0,0,0,0.6)',  # Semi-transparent dark pattern lines
-                        size=10,  # Slightly larger pattern size for visibility
-                        solidity=0.4  # Pattern density
-                    )
-                )
-            )
-            
-            fig_contracts_stacked.update_layout(
-                height=500,
-                xaxis_title="Contract End Year",
-                yaxis_title="Number of Projects",
-                margin=dict(l=50, r=150, t=50, b=50)
-            )
-            
-            if len(contract_trend_year["End_Year"].unique()) > 1:
-                year_range = contract_trend_year["End_Year"].max() - contract_trend_year["End_Year"].min()
-                fig_contracts_stacked.update_xaxes(
-                    tickmode="linear",
-                    dtick=1 if year_range <= 10 else 2
-                )
-            
+        if not contract_trend_year.empty:
+            # Figures are rebuilt only when the filtered data changes
+            fig_contracts_stacked = contract_end_figure(filtered_data_version(), current_display_df)
             st.plotly_chart(fig_contracts_stacked, use_container_width=True)
 
+# Customers drawn individually in the contract end chart before "Other"
+CONTRACT_CHART_MAX_CUSTOMERS = 30
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def contract_end_figure(data_version, _df):
+    """Stacked bar of projects per contract end year, one pastel/pattern per customer"""
+    contract_trend_year = contract_year_counts(data_version, _df)
+    
+    # Each customer is its own trace; past the busiest ones the rest share one
+    customer_totals = contract_trend_year.groupby("Customer Name", observed=True, sort=False)["Project_Count"].sum()
+    if len(customer_totals) > CONTRACT_CHART_MAX_CUSTOMERS:
+        top_customers = customer_totals.nlargest(CONTRACT_CHART_MAX_CUSTOMERS).index
+        customer_names = contract_trend_year["Customer Name"].astype(object)
+        customer_names = customer_names.where(customer_names.isin(top_customers), "Other")
+        contract_trend_year = contract_trend_year.groupby(
+            ["End_Year", customer_names]
+        )["Project_Count"].sum().reset_index()
+    
+    # Maximize pastel colors, then add patterns on top when cycling through
+    unique_customers = contract_trend_year["Customer Name"].unique()
+    num_customers = len(unique_customers)
+    
+    # Beautiful distinct pastel colors (optimized for 15 unique solids)
+    pastel_colors = [
+        '#FFB3BA',  # Light pink
+        '#BAFFC9',  # Light mint green  
+        '#BAE1FF',  # Light sky blue
+        '#FFFFBA',  # Light yellow
+        '#FFD1BA',  # Light peach
+        '#E1BAFF',  # Light lavender
+        '#FFBAF3',  # Light magenta
+        '#C9FFBA',  # Light lime
+        '#BABFFF',  # Light periwinkle
+        '#F3FFBA',  # Light cream
+        '#FFBAC9',  # Light coral
+        '#BAFFE1',  # Light aqua
+        '#D1BAFF',  # Light purple
+        '#FFF3BA',  # Light lemon
+        '#FFBAD1'   # Light rose
+    ]
+    
+    # Clean, professional patterns for when we cycle through colors
+    patterns = ["", ".", "/", "\\", "|", "+", "x"]  # Solid first, then patterns
+    
+    # Smart assignment: use all pastels first, then add patterns on top
+    customer_colors = {}
+    customer_patterns = {}
+    
+    for i, customer in enumerate(unique_customers):
+        # Assign pastel color (cycle through the full palette)
+        color_index = i % len(pastel_colors)
+        customer_colors[customer] = pastel_colors[color_index]
+        
+        # Assign pattern: solid for first 15, then patterns for 16+
+        if i < 15:
+            # First 15 customers - all solid pastels
+            customer_patterns[customer] = ""
+        else:
+            # Customer 16+ - cycle through pastels with patterns
+            pattern_round = (i - 15) // len(pastel_colors)
+            pattern_index = (pattern_round % (len(patterns) - 1)) + 1  # Skip solid pattern ""
+            customer_patterns[customer] = patterns[pattern_index]
+    
+    # Add pattern column to dataframe
+    contract_trend_year['Pattern'] = contract_trend_year['Customer Name'].map(customer_patterns)
+    
+    fig_contracts_stacked = px.bar(
+        contract_trend_year,
+        x="End_Year",
+        y="Project_Count", 
+        color="Customer Name",
+        pattern_shape="Pattern",
+        title="🎯 Projects by Contract End Date (Stacked)",
+        barmode="stack",
+        color_discrete_map=customer_colors
+    )
+    
+    # Enhanced styling: Keep pastel colors as background with visible patterns
+    fig_contracts_stacked.update_traces(
+        marker=dict(
+            line=dict(color='white', width=2),  # White borders around all bars
+            pattern=dict(
+                fillmode='overlay',  # Overlay pattern on pastel color
+                fgcolor='rgba(0,0,0,0.6)',  # Semi-transparent dark pattern lines
+                size=10,  # Slightly larger pattern size for visibility
+                solidity=0.4  # Pattern density
+            )
+        )
+    )
+    
+    fig_contracts_stacked.update_layout(
+        height=500,
+        xaxis_title="Contract End Year",
+        yaxis_title="Number of Projects",
+        margin=dict(l=50, r=150, t=50, b=50)
+    )
+    
+    if contract_trend_year["End_Year"].nunique() > 1:
+        year_range = contract_trend_year["End_Year"].max() - contract_trend_year["End_Year"].min()
+        fig_contracts_stacked.update_xaxes(
+            tickmode="linear",
+            dtick=1 if year_range <= 10 else 2
+        )
+    
+    return fig_contracts_stacked
+
 def display_embedded_documents():
     """Display embedded PDF documents"""
     st.markdown("---")
@@ -779,9 +795,73 @@ def get_status_column(df):
         return "Status (R/G/Y)"
     return None
 
+def present_value_counts(series):
+    """Value counts for the values present in a series, ties in order of appearance"""
+    # Categorical columns also report categories that this subset doesn't contain
+    counts = series.value_counts(sort=False)
+    counts = counts[counts > 0].reindex(series.dropna().unique())
+    return counts.sort_values(ascending=False, kind="stable")
+
+def filtered_data_version():
+    """Version token apply_filters set for the frame this page renders"""
+    return st.session_state["data_version"]
+
+# Aggregations below are cached on the data version, so reruns that leave the
+# filters unchanged skip the scans; the frame is passed unhashed as _df
+@st.cache_data(max_entries=16, show_spinner=False)
+def key_metric_totals(data_version, _df):
+    """Project, churned, customer and use case totals for the KPI cards"""
+    churned = 0
+    if "Churn" in _df.columns:
+        # Churn is a label column, so coerce each distinct label once and
+        # weight it by its count rather than converting every row
+        churn_counts = _df["Churn"].value_counts(sort=False)
+        churn_values = pd.to_numeric(np.asarray(churn_counts.index, dtype=object), errors='coerce')
+        churned = int(np.nansum(churn_values * churn_counts.to_numpy()))
+    unique_customers = _df["Customer Name"].nunique() if "Customer Name" in _df.columns else 0
+    total_usecases = _df["Total Usecases/Module"].sum() if "Total Usecases/Module" in _df.columns else 0
+    return len(_df), churned, unique_customers, total_usecases
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def names_by_group(data_version, _df, keys, value_col="Customer Name"):
+    """Comma-separated values of value_col per group of keys, built in one groupby pass"""
+    return {
+        key: ", ".join(map(str, present_value_counts(group).index))
+        for key, group in _df.groupby(keys, observed=True, sort=False)[value_col]
+    }
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def value_counts_frame(data_version, _df, column):
+    """Value counts of a column as a two-column frame, most frequent first"""
+    # Ties keep the order values first appear in, not the sorted category order
+    return present_value_counts(_df[column]).rename_axis(column).reset_index(name="count")
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def group_sizes(data_version, _df, keys):
+    """Row count for each observed combination of the key columns"""
+    return _df[keys].value_counts(sort=False).reset_index(name="Count")
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def clients_by_geography(data_version, _df):
+    """Distinct clients per geography with their count and a joined name list"""
+    geo_clients = _df.groupby("Geography", observed=True)["Customer Name"].apply(
+        lambda x: list(x.unique())
+    ).reset_index()
+    geo_clients["Client_Count"] = geo_clients["Customer Name"].apply(len)
+    geo_clients["Client_Names"] = geo_clients["Customer Name"].apply(lambda x: ", ".join(x))
+    return geo_clients
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def contract_year_counts(data_version, _df):
+    """Projects per (contract end year, customer)"""
+    contract_project_data = _df[["Contract End Date", "Customer Name"]].dropna()
+    contract_years = pd.DataFrame({
+        "End_Year": contract_project_data["Contract End Date"].dt.year,
+        "Customer Name": contract_project_data["Customer Name"],
+    })
+    return contract_years.value_counts(sort=False).reset_index(name="Project_Count")
+
 def get_health_column(df):
     """Get the customer health column name"""
-    for col in df.columns:
-        if "customer health" in col.lower():
-            return col
-    return None 
\ No newline at end of file
+    matches = df.columns[df.columns.str.lower().str.contains("customer health", regex=False, na=False)]
+    return matches[0] if len(matches) else None 
\ No newline at end of file
@@ -1,6 +1,7 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from utils.data_loader import month_start
 
 def show_page(current_display_df):
     """Display the Revenue page"""
@@ -42,20 +43,27 @@ def show_page(current_display_df):
     else:
         st.warning("No data loaded/matches filters to display revenue information.")
 
+# Deletion table for currency formatting, applied in one str.translate pass
+CURRENCY_CHARS = str.maketrans("", "", "$,")
+
 def clean_revenue_data(df):
     """Clean numeric columns by removing currency symbols and converting to numeric"""
-    df = df.copy()
+    df = df.copy(deep=False)
     numeric_columns_to_clean = ["Current ARR", "Contracted ARR", "Recognized ARR", "Services Revenue"]
     
     for col in numeric_columns_to_clean:
         if col in df.columns:
-            df[col] = pd.to_numeric(
-                df[col].astype(str).str.replace(r'[\$,]', '', regex=True), 
-                errors='coerce'
-            ).fillna(0)
+            values = df[col]
+            if not pd.api.types.is_numeric_dtype(values):
+                values = values.astype(str).str.translate(CURRENCY_CHARS)
+            df[col] = pd.to_numeric(values, errors='coerce').fillna(0)
     
     return df
 
+def dollar_labels(values):
+    """Whole-dollar bar labels for a numeric column"""
+    return [f"${value:,.0f}" for value in values.to_numpy()]
+
 def display_revenue_metrics(current_display_df):
     """Display key revenue KPIs"""
     st.markdown("### 📊 Key Revenue KPIs")
@@ -147,7 +155,7 @@ def display_revenue_by_geography(current_display_df, arr_column):
                 color_continuous_scale="Viridis"
             )
             fig_geo_revenue.update_traces(
-                text=geo_revenue[arr_column].apply(lambda x: f"${x:,.0f}"), 
+                text=dollar_labels(geo_revenue[arr_column]), 
                 textposition="outside"
             )
             fig_geo_revenue.update_layout(height=450)
@@ -159,8 +167,9 @@ def display_top_customers_revenue(current_display_df, arr_column):
     """Display top customers by revenue"""
     if arr_column in current_display_df.columns and "Customer Name" in current_display_df.columns:
         st.subheader(f"Top 10 Customers by {arr_column}")
-        revenue_by_customer = current_display_df.groupby("Customer Name", observed=True)[arr_column].sum().reset_index()
-        revenue_by_customer = revenue_by_customer.sort_values(arr_column, ascending=False).head(10)
+        # Only the top 10 groups are kept, so skip sorting every customer
+        customer_totals = current_display_df.groupby("Customer Name", observed=True, sort=False)[arr_column].sum()
+        revenue_by_customer = customer_totals.nlargest(10).reset_index()
         
         if not revenue_by_customer.empty:
             fig_customer_revenue = px.bar(
@@ -172,7 +181,7 @@ def display_top_customers_revenue(current_display_df, arr_column):
                 color_continuous_scale="Greens"
             )
             fig_customer_revenue.update_traces(
-                text=revenue_by_customer[arr_column].apply(lambda x: f"${x:,.0f}"), 
+                text=dollar_labels(revenue_by_customer[arr_column]), 
                 textposition="outside"
             )
             fig_customer_revenue.update_layout(
@@ -223,8 +232,7 @@ def display_revenue_trends(current_display_df, arr_column):
         st.subheader("Revenue Trends Over Time")
         
         # Group by month and sum revenue
-        revenue_trend = current_display_df.groupby(current_display_df["Contract Start Date"].dt.to_period("M"))[arr_column].sum().reset_index()
-        revenue_trend["Contract Start Date"] = revenue_trend["Contract Start Date"].dt.to_timestamp()
+        revenue_trend = current_display_df.groupby(month_start(current_display_df["Contract Start Date"]))[arr_column].sum().reset_index()
         
         if not revenue_trend.empty:
             fig_revenue_trend = px.line(
@@ -284,7 +292,7 @@ def display_revenue_by_application(current_display_df, arr_column):
                 color_continuous_scale="Oranges"
             )
             fig_app_revenue.update_traces(
-                text=app_revenue[arr_column].apply(lambda x: f"${x:,.0f}"), 
+                text=dollar_labels(app_revenue[arr_column]), 
                 textposition="outside"
             )
             fig_app_revenue.update_layout(height=450)
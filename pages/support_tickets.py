@@ -102,12 +102,12 @@ def display_ticket_metrics(current_display_df):
         
         # Open/New tickets
         open_statuses = ["Open", "New", "In Progress", "Waiting", "new", "open", "in progress"]
-        open_tickets = current_display_df[current_display_df[status_col].isin(open_statuses)].shape[0]
+        open_tickets = int(current_display_df[status_col].isin(open_statuses).sum())
         ticket_kpi_row[1].metric("Open Tickets", f"{open_tickets:,}")
         
         # Closed tickets
         closed_statuses = ["Closed", "Resolved", "Solved", "closed", "resolved", "solved"]
-        closed_tickets = current_display_df[current_display_df[status_col].isin(closed_statuses)].shape[0]
+        closed_tickets = int(current_display_df[status_col].isin(closed_statuses).sum())
         ticket_kpi_row[2].metric("Closed Tickets", f"{closed_tickets:,}")
     else:
         ticket_kpi_row[1].metric("Open Tickets", "N/A")
@@ -118,12 +118,12 @@ def display_ticket_metrics(current_display_df):
     
     if priority_col and not current_display_df[priority_col].empty:
         high_priority_values = ["High", "Critical", "Urgent", "high", "critical", "urgent"]
-        high_priority = current_display_df[current_display_df[priority_col].isin(high_priority_values)].shape[0]
+        high_priority = int(current_display_df[priority_col].isin(high_priority_values).sum())
         ticket_kpi_row[3].metric("High Priority", f"{high_priority:,}")
     else:
         # Show recent tickets instead
         if "Created Date" in current_display_df.columns:
-            recent_tickets = current_display_df[current_display_df["Created Date"] > pd.Timestamp.now() - pd.Timedelta(days=7)].shape[0]
+            recent_tickets = int((current_display_df["Created Date"] > pd.Timestamp.now() - pd.Timedelta(days=7)).sum())
             ticket_kpi_row[3].metric("Last 7 Days", f"{recent_tickets:,}")
         else:
             ticket_kpi_row[3].metric("Categories", f"{current_display_df['Category'].nunique() if 'Category' in current_display_df.columns else 'N/A'}")
@@ -205,10 +205,12 @@ def display_tickets_timeline(current_display_df):
     if "Created Date" in current_display_df.columns:
         st.subheader("Tickets Created Over Time")
         
-        # Group by date
-        tickets_by_date = current_display_df.copy()
-        tickets_by_date["Created Date"] = pd.to_datetime(tickets_by_date["Created Date"]).dt.date
-        daily_tickets = tickets_by_date.groupby("Created Date").size().reset_index(name="Count")
+        # Group by date; only the date key is derived, the frame itself is not copied
+        created_dates = current_display_df["Created Date"]
+        if not pd.api.types.is_datetime64_any_dtype(created_dates):
+            created_dates = pd.to_datetime(created_dates)
+        created_dates = created_dates.dt.date
+        daily_tickets = current_display_df.groupby(created_dates).size().reset_index(name="Count")
         
         fig_timeline = px.line(
             daily_tickets,
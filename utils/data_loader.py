@@ -1,10 +1,21 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
 import os
 import io
-import requests
+import glob
+import uuid
+import time
+import hashlib
+import tempfile
+import functools
 from datetime import datetime
 
+# Copy-on-write lets filtered frames share column data with the loaded frame
+# until a column is actually replaced, instead of copying the whole table
+pd.set_option("mode.copy_on_write", True)
+
 # Google Sheets Configuration
 GOOGLE_SHEET_ID = "1Nxvj1LRWYIw3cQcX2Qz9RJmvv17JlCe-V8G2tmvqHfE"
 BASE_GOOGLE_SHEETS_URL = f"https://docs.google.com/spreadsheets/d/{GOOGLE_SHEET_ID}/export?format=csv"
@@ -35,20 +46,192 @@ DATA_SOURCES = {
     }
 }
 
+DATE_COLUMNS = ["Contract Start Date", "Contract End Date", "Project Start Date"]
+
+# Low-cardinality label columns are parsed straight to categoricals so pandas
+# skips type inference for them; columns missing from a file are ignored
+CATEGORY_COLUMNS = ["Exective", "Owner", "Project Status (R/G/Y)", "Status (R/G/Y)", "Customer health",
+                    "Geography", "Application", "Industrial Sector", "Industry Sector"]
+COLUMN_DTYPES = {col: "category" for col in CATEGORY_COLUMNS}
+
+# Near-unique text columns gain nothing from categories; Arrow-backed strings
+# store them compactly and run .str methods as Arrow compute kernels
+ARROW_STRING_COLUMNS = ["Customer Name", "Logo Name"]
+COLUMN_DTYPES.update({col: "string[pyarrow]" for col in ARROW_STRING_COLUMNS})
+
+# Columns normalized by apply_filters before the sidebar filters are built
+FILTER_LABEL_COLUMNS = ["Exective", "Owner", "Project Status (R/G/Y)", "Status (R/G/Y)", "Churn",
+                        "Customer Name", "Geography", "Application", "Customer Health"]
+FILTER_NUMERIC_COLUMNS = ["Revenue", "NRR", "GRR", "Total Usecases/Module", "Services Revenue"]
+
+def convert_date_columns(df):
+    """Convert known date columns in place if they exist"""
+    for date_col in DATE_COLUMNS:
+        if date_col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    return df
+
+def month_start(dates):
+    """Truncate a datetime column to the first of each month, keeping NaT"""
+    # numpy month truncation avoids building Period objects for every row
+    months = dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[M]").astype("datetime64[ns]")
+    return pd.Series(months, index=dates.index, name=dates.name)
+
+# Text columns repeating most of their values are stored as categoricals, so
+# value_counts/groupby/isin on columns outside CATEGORY_COLUMNS hash codes
+LOW_CARDINALITY_RATIO = 0.5
+
+def first_seen_categorical(series):
+    """Categorical with categories in order of first appearance"""
+    # value_counts breaks ties in category order; text columns break them by
+    # first appearance, so keep that order instead of sorting the labels
+    return series.astype(pd.CategoricalDtype(series.dropna().unique().tolist()))
+
+def categorize_low_cardinality(df):
+    """Convert repetitive text columns of a freshly parsed frame to categoricals"""
+    if df.empty:
+        return df
+    for col in df.select_dtypes(include="object").columns:
+        if col in FILTER_NUMERIC_COLUMNS:
+            continue
+        # Blank padding rows are not values; rate repetition over filled cells
+        filled = df[col].count()
+        if filled and df[col].nunique() / filled < LOW_CARDINALITY_RATIO:
+            df[col] = first_seen_categorical(df[col])
+    return df
+
+def read_csv_with_fallback(source):
+    """Read CSV with a latin1 fallback for non-UTF-8 files"""
+    try:
+        return pd.read_csv(source, dtype=COLUMN_DTYPES)
+    except UnicodeDecodeError:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return pd.read_csv(source, encoding='latin1', dtype=COLUMN_DTYPES)
+
+# Seconds a downloaded sheet is reused before it is fetched again
+URL_CACHE_TTL = 3600
+
+def url_refresh_window():
+    """Index of the current URL_CACHE_TTL-long window; a new one refetches sheets"""
+    return int(time.time() // URL_CACHE_TTL)
+
+# Parsed frames are cached so widget reruns skip re-reading and re-parsing;
+# uploads and user-entered URLs are open-ended, so only the latest few are kept
+@st.cache_data(max_entries=8, show_spinner=False)
+def fetch_csv_from_url(url, refresh_window):
+    """Download and parse CSV data from URL (fetched again in each refresh window)"""
+    return categorize_low_cardinality(convert_date_columns(read_csv_with_fallback(url)))
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def parse_file_bytes(data, is_excel):
+    """Parse uploaded CSV/Excel content (cached on the file bytes)"""
+    if is_excel:
+        df = pd.read_excel(io.BytesIO(data))
+    else:
+        df = read_csv_with_fallback(io.BytesIO(data))
+    return categorize_low_cardinality(convert_date_columns(df))
+
+# Parsed local CSVs are also kept as Parquet in a cache folder outside the
+# app, so a cold start reads typed columns back instead of parsing the text
+PARQUET_CACHE_DIR = os.path.join(tempfile.gettempdir(), "opsreview-parquet")
+
+@functools.lru_cache(maxsize=1)
+def parse_rules_fingerprint():
+    """Digest of this module and the parser versions that shape a parsed frame"""
+    # The dtype rules and parse helpers live in this file, so any edit to it
+    # renames the cached copies and ones written under old rules are not read
+    with open(__file__, "rb") as source:
+        digest = hashlib.sha256(source.read())
+    digest.update(f"{pd.__version__}:{pa.__version__}".encode())
+    return digest.hexdigest()[:16]
+
+def parquet_cache_paths(file_path):
+    """Cached Parquet path for the current CSV contents, and the glob of its older copies"""
+    source = os.path.abspath(file_path)
+    stat = os.stat(source)
+    prefix = f"{os.path.basename(source)}-{hashlib.sha256(source.encode()).hexdigest()[:12]}"
+    version = hashlib.sha256(f"{stat.st_mtime_ns}:{stat.st_size}:{parse_rules_fingerprint()}".encode()).hexdigest()[:16]
+    return os.path.join(PARQUET_CACHE_DIR, f"{prefix}-{version}.parquet"), os.path.join(PARQUET_CACHE_DIR, f"{prefix}-*.parquet")
+
+def read_parquet_copy(file_path):
+    """Return the cached Parquet copy of a local CSV, or None if there is none"""
+    cached_path, _ = parquet_cache_paths(file_path)
+    if not os.path.exists(cached_path):
+        return None
+    try:
+        df = pd.read_parquet(cached_path)
+    except (OSError, pa.ArrowException):
+        # An unreadable copy is parsed again and overwritten
+        return None
+    # Parquet restores these as Python-backed strings; keep them on Arrow
+    return df.astype({col: COLUMN_DTYPES[col] for col in ARROW_STRING_COLUMNS if col in df.columns})
+
+def write_parquet_copy(file_path, df):
+    """Cache a parsed CSV as Parquet, replacing copies of its earlier versions"""
+    cached_path, older_copies = parquet_cache_paths(file_path)
+    partial_path = f"{cached_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(PARQUET_CACHE_DIR, exist_ok=True)
+        df.to_parquet(partial_path, index=False)
+        # Concurrent sessions only ever see a complete file under the final name
+        os.replace(partial_path, cached_path)
+        for older in glob.glob(older_copies):
+            if older != cached_path:
+                os.remove(older)
+    except (OSError, pa.ArrowException):
+        # Unwritable cache folders and columns Arrow cannot store skip the copy
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+@st.cache_data(show_spinner=False)
+def read_local_csv(file_path, mtime):
+    """Parse a local CSV file (cached until its mtime changes)"""
+    df = read_parquet_copy(file_path)
+    if df is not None:
+        return df
+    df = categorize_low_cardinality(convert_date_columns(read_csv_with_fallback(file_path)))
+    write_parquet_copy(file_path, df)
+    return df
+
+@st.cache_data(show_spinner=False)
+def read_local_excel(file_path, mtime):
+    """Parse every sheet of a local workbook in one pass (cached until its mtime changes)"""
+    return pd.read_excel(file_path, sheet_name=None)
+
+# Loaded frames kept per session, so moving between pages whose sources differ
+# returns to the same frame (and its prepared copy) instead of reloading it
+SESSION_FRAME_SLOTS = 4
+
+def remember_in_session(slot, key, value):
+    """Store value under key in a small per-session dict, dropping the oldest entry"""
+    entries = st.session_state.setdefault(slot, {})
+    entries.pop(key, None)
+    entries[key] = value
+    while len(entries) > SESSION_FRAME_SLOTS:
+        entries.pop(next(iter(entries)))
+    return value
+
+def session_cached_frame(key, load):
+    """Reuse the frame loaded for key earlier in this session, else call load()"""
+    # Reruns skip the cache lookup and its copy entirely
+    cached = st.session_state.get("loaded_frames", {}).get(key)
+    if cached is not None:
+        return cached
+    return remember_in_session("loaded_frames", key, load())
+
+def local_data_path(filename):
+    """Path of a data file shipped in the repository root"""
+    return os.path.join(os.path.dirname(__file__), "..", filename)
+
 def read_data_from_url(url):
     """Read CSV data from URL with encoding fallback"""
     try:
-        try:
-            df = pd.read_csv(url)
-        except UnicodeDecodeError:
-            df = pd.read_csv(url, encoding='latin1')
-        
-        # Convert date columns if they exist
-        for date_col in ["Contract Start Date", "Contract End Date", "Project Start Date"]:
-            if date_col in df.columns:
-                df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-        
-        return df
+        # Keep the same frame across reruns like local files do, so the
+        # prepared filter frame and data-version caches stay valid; the session
+        # and the fetch cache share the window key, so a new window refetches
+        refresh_window = url_refresh_window()
+        return session_cached_frame(("url", url, refresh_window), lambda: fetch_csv_from_url(url, refresh_window))
     except Exception as e:
         st.error(f"Error reading data from URL: {e}")
         return None
@@ -56,13 +239,9 @@ def read_data_from_url(url):
 def load_may_revenue_excel():
     """Load May 2025 Excel file"""
     try:
-        excel_file_path = os.path.join(os.path.dirname(__file__), "..", "May'25 Revenue.xlsx")
+        excel_file_path = local_data_path("May'25 Revenue.xlsx")
         if os.path.exists(excel_file_path):
-            excel_data = {}
-            with pd.ExcelFile(excel_file_path) as xls:
-                for sheet_name in xls.sheet_names:
-                    excel_data[sheet_name] = pd.read_excel(excel_file_path, sheet_name=sheet_name)
-            return excel_data
+            return read_local_excel(excel_file_path, os.path.getmtime(excel_file_path))
         else:
             st.warning(f"Excel file 'May'25 Revenue.xlsx' not found")
             return None
@@ -72,6 +251,9 @@ def load_may_revenue_excel():
 
 def fetch_hubspot_tickets(api_key):
     """Fetch tickets from HubSpot API"""
+    # Imported here so page loads that never reach HubSpot skip requests
+    import requests
+    
     try:
         headers = {
             'Authorization': f'Bearer {api_key}',
@@ -236,9 +418,10 @@ def load_revenue_data():
 
 def load_local_revenue_fallback():
     """Load local Revenue.csv as fallback"""
-    data_file_path = os.path.join(os.path.dirname(__file__), "..", "Revenue.csv")
+    data_file_path = local_data_path("Revenue.csv")
     if os.path.exists(data_file_path):
-        df = pd.read_csv(data_file_path)
+        mtime = os.path.getmtime(data_file_path)
+        df = session_cached_frame(("file", data_file_path, mtime), lambda: read_local_csv(data_file_path, mtime))
         st.success("✅ Revenue.csv loaded successfully!")
         return df
     else:
@@ -250,19 +433,9 @@ def load_from_upload():
     uploaded_file = st.file_uploader("Choose a CSV or Excel file", type=["csv", "xlsx"])
     if uploaded_file is not None:
         try:
-            if uploaded_file.name.endswith('.csv'):
-                try:
-                    df = pd.read_csv(uploaded_file)
-                except UnicodeDecodeError:
-                    df = pd.read_csv(uploaded_file, encoding='latin1')
-            else:
-                df = pd.read_excel(uploaded_file)
-            
-            # Convert date columns
-            for date_col in ["Contract Start Date", "Contract End Date", "Project Start Date"]:
-                if date_col in df.columns:
-                    df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-            
+            is_excel = not uploaded_file.name.endswith('.csv')
+            df = session_cached_frame(("upload", uploaded_file.file_id),
+                                      lambda: parse_file_bytes(uploaded_file.getvalue(), is_excel))
             st.success("File uploaded successfully!")
             return df
         except Exception as e:
@@ -305,13 +478,10 @@ def load_from_default_file(page):
 
 def load_local_fallback(filename, fallback=None):
     """Load local CSV file with optional fallback"""
-    file_path = os.path.join(os.path.dirname(__file__), "..", filename)
+    file_path = local_data_path(filename)
     if os.path.exists(file_path):
-        df = pd.read_csv(file_path)
-        # Convert date columns
-        for date_col in ["Contract Start Date", "Contract End Date", "Project Start Date"]:
-            if date_col in df.columns:
-                df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+        mtime = os.path.getmtime(file_path)
+        df = session_cached_frame(("file", file_path, mtime), lambda: read_local_csv(file_path, mtime))
         st.success(f"✅ {filename} loaded successfully!")
         return df
     elif fallback:
@@ -321,93 +491,183 @@ def load_local_fallback(filename, fallback=None):
         st.error(f"❌ File '{filename}' not found.")
         return pd.DataFrame()
 
-def apply_filters(df):
-    """Apply sidebar filters to dataframe"""
-    if df.empty:
-        return df
+def normalize_label_column(series):
+    """Strip labels and fill blanks with "Unknown" as a categorical column"""
+    if series.dtype.name != "category":
+        series = series.astype("category")
     
-    df_filtered = df.copy()
+    # Work on the category dictionary rather than every row; labels that only
+    # differ by whitespace merge, and missing values (code -1) map to "Unknown"
+    labels = pd.Categorical(list(series.cat.categories.astype(str).str.strip()) + ["Unknown"])
+    codes = labels.codes[series.cat.codes.to_numpy()]
+    normalized = pd.Categorical.from_codes(codes, labels.categories)
+    return pd.Series(normalized, index=series.index, name=series.name).cat.remove_unused_categories()
+
+def filter_options(series):
+    """Sorted values present in a column, read from its categories when possible"""
+    if series.dtype.name == "category":
+        return sorted(series.cat.remove_unused_categories().cat.categories)
+    return sorted(series.dropna().unique())
+
+# Values remembered per prepared frame before the filter memo is cleared
+FILTER_MEMO_SIZE = 64
+
+def session_filter_memo(token, key, compute):
+    """Result of compute() for key, remembered for the prepared frame with this token"""
+    # Filter options and date ranges only change when the prepared frame or an
+    # earlier filter does, so unrelated widget reruns skip the column scans
+    memo = st.session_state.get("filter_memo")
+    if memo is None or memo[0] != token:
+        memo = (token, {})
+        st.session_state["filter_memo"] = memo
+    values = memo[1]
+    if key not in values:
+        if len(values) >= FILTER_MEMO_SIZE:
+            values.clear()
+        values[key] = compute()
+    return values[key]
+
+def date_range(series):
+    """Earliest and latest value of a date column (NaT when it has none)"""
+    return series.min(), series.max()
+
+def filtered_frame(prepared, mask):
+    """Rows of the prepared frame selected by mask, without emptied categories"""
+    df_filtered = prepared.copy(deep=False) if mask.all() else prepared.loc[mask]
+    # Drop categories emptied by the filters so value_counts/groupby skip them
+    for col in df_filtered.select_dtypes("category").columns:
+        df_filtered[col] = df_filtered[col].cat.remove_unused_categories()
+    return df_filtered
+
+def prepare_filter_frame(df):
+    """Clean column names and convert the columns the sidebar filters work on"""
+    prepared = df.copy(deep=False)
     
     # Clean column names
-    df_filtered.columns = df_filtered.columns.str.strip().str.replace('ï»¿', '', regex=False)
+    prepared.columns = prepared.columns.str.strip().str.replace('ï»¿', '', regex=False)
     
-    # Convert date columns
-    for col in ["Contract Start Date", "Contract End Date", "Project Start Date"]:
-        if col in df_filtered.columns:
-            df_filtered[col] = pd.to_datetime(df_filtered[col], errors='coerce')
-    
-    # Ensure string columns for filters
-    for col in ["Exective", "Owner", "Project Status (R/G/Y)", "Status (R/G/Y)", "Churn", "Customer Name", "Geography", "Application", "Customer Health"]:
-        if col in df_filtered.columns:
-            df_filtered[col] = df_filtered[col].astype(str).str.strip().fillna("Unknown")
+    # Convert date, filter label and numeric columns, then swap them in at once
+    converted = {}
+    for col in prepared.columns:
+        if col in DATE_COLUMNS:
+            if not pd.api.types.is_datetime64_any_dtype(prepared[col]):
+                converted[col] = pd.to_datetime(prepared[col], errors='coerce')
+        elif col in FILTER_LABEL_COLUMNS:
+            converted[col] = normalize_label_column(prepared[col])
+        elif col in FILTER_NUMERIC_COLUMNS:
+            converted[col] = pd.to_numeric(prepared[col], errors='coerce').fillna(0)
+    if converted:
+        prepared = prepared.assign(**converted)
+    return prepared
+
+def session_prepared_frame(df):
+    """Prepared copy of a loaded frame and its version token, reused across reruns"""
+    # Loaded frames are reused by identity across reruns (session_cached_frame),
+    # so the conversions only run again when a different frame arrives. Each
+    # entry keeps a reference to its source, so the id cannot be recycled.
+    cached = st.session_state.get("filter_bases", {}).get(id(df))
+    if cached is not None and cached[0] is df:
+        return cached[1], cached[2]
+    prepared = prepare_filter_frame(df)
+    token = uuid.uuid4().hex
+    remember_in_session("filter_bases", id(df), (df, prepared, token))
+    return prepared, token
+
+def apply_filters(df):
+    """Apply sidebar filters to dataframe"""
+    if df.empty:
+        return df
     
-    # Ensure numeric columns
-    for col in ["Revenue", "NRR", "GRR", "Total Usecases/Module", "Services Revenue"]:
-        if col in df_filtered.columns:
-            df_filtered[col] = pd.to_numeric(df_filtered[col], errors='coerce').fillna(0)
+    prepared, token = session_prepared_frame(df)
+    columns = prepared.columns
+    # Filters AND into one row mask; the frame is sliced once at the end
+    mask = np.ones(len(prepared), dtype=bool)
+    selections = []
     
     st.sidebar.subheader("Filter Data")
     
     # Customer filter
-    if "Customer Name" in df_filtered.columns:
-        customers = sorted(df_filtered["Customer Name"].unique())
+    if "Customer Name" in columns:
+        customers = session_filter_memo(token, ("options", "Customer Name", tuple(selections)),
+                                        lambda: filter_options(prepared["Customer Name"][mask]))
         cust_filter = st.sidebar.multiselect("Filter by Customer Name", options=customers, default=[])
+        selections.append(tuple(cust_filter))
         if cust_filter:
-            df_filtered = df_filtered[df_filtered["Customer Name"].isin(cust_filter)]
+            mask &= prepared["Customer Name"].isin(cust_filter).to_numpy()
     
     # Executive/Owner filter
-    exec_col = "Exective" if "Exective" in df_filtered.columns else "Owner" if "Owner" in df_filtered.columns else None
+    exec_col = "Exective" if "Exective" in columns else "Owner" if "Owner" in columns else None
     if exec_col:
-        executives = sorted(df_filtered[exec_col].unique())
+        executives = session_filter_memo(token, ("options", exec_col, tuple(selections)),
+                                         lambda: filter_options(prepared[exec_col][mask]))
         exec_filter = st.sidebar.multiselect(f"Filter by {exec_col}", options=executives, default=[])
+        selections.append(tuple(exec_filter))
         if exec_filter:
-            df_filtered = df_filtered[df_filtered[exec_col].isin(exec_filter)]
+            mask &= prepared[exec_col].isin(exec_filter).to_numpy()
     
     # Status filter
-    status_col = "Project Status (R/G/Y)" if "Project Status (R/G/Y)" in df_filtered.columns else "Status (R/G/Y)" if "Status (R/G/Y)" in df_filtered.columns else None
+    status_col = "Project Status (R/G/Y)" if "Project Status (R/G/Y)" in columns else "Status (R/G/Y)" if "Status (R/G/Y)" in columns else None
     if status_col:
-        status_unique = sorted(df_filtered[status_col].unique())
+        status_unique = session_filter_memo(token, ("options", status_col, tuple(selections)),
+                                            lambda: filter_options(prepared[status_col][mask]))
         status_filter = st.sidebar.multiselect("Filter by Status", options=status_unique, default=[])
+        selections.append(tuple(status_filter))
         if status_filter:
-            df_filtered = df_filtered[df_filtered[status_col].isin(status_filter)]
+            mask &= prepared[status_col].isin(status_filter).to_numpy()
     
     # Customer Health filter
-    health_filter_col = None
-    for col in df_filtered.columns:
-        if "customer health" in col.lower():
-            health_filter_col = col
-            break
+    health_matches = columns[columns.str.lower().str.contains("customer health", regex=False, na=False)]
+    health_filter_col = health_matches[0] if len(health_matches) else None
     
     if health_filter_col:
         health_options = ["Green", "Yellow", "Red"]
-        available_health = [h for h in health_options if h in df_filtered[health_filter_col].unique()]
+        present_health = session_filter_memo(token, ("options", health_filter_col, tuple(selections)),
+                                             lambda: filter_options(prepared[health_filter_col][mask]))
+        available_health = [h for h in health_options if h in present_health]
         if available_health:
             health_filter = st.sidebar.multiselect("Filter by Customer Health", options=available_health, default=[])
+            selections.append(tuple(health_filter))
             if health_filter:
-                df_filtered = df_filtered[df_filtered[health_filter_col].isin(health_filter)]
+                mask &= prepared[health_filter_col].isin(health_filter).to_numpy()
     
     # Date filters
-    if "Project Start Date" in df_filtered.columns and not df_filtered["Project Start Date"].isnull().all():
-        proj_min_date = df_filtered["Project Start Date"].min()
-        proj_max_date = df_filtered["Project Start Date"].max()
-        st.sidebar.subheader("📅 Filter by Project Start Date")
+    if "Project Start Date" in columns:
+        proj_min_date, proj_max_date = session_filter_memo(token, ("range", "Project Start Date", tuple(selections)),
+                                                           lambda: date_range(prepared["Project Start Date"][mask]))
         if not (pd.isna(proj_min_date) or pd.isna(proj_max_date)):
+            st.sidebar.subheader("📅 Filter by Project Start Date")
             proj_start_date = st.sidebar.date_input("Project Start From", proj_min_date, min_value=proj_min_date, max_value=proj_max_date)
             proj_end_date = st.sidebar.date_input("Project Start To", proj_max_date, min_value=proj_min_date, max_value=proj_max_date)
+            selections.append((str(proj_start_date), str(proj_end_date)))
             if proj_start_date <= proj_end_date:
-                df_filtered = df_filtered[(df_filtered["Project Start Date"] >= pd.to_datetime(proj_start_date)) & 
-                                        (df_filtered["Project Start Date"] <= pd.to_datetime(proj_end_date))].copy()
+                mask &= prepared["Project Start Date"].between(pd.Timestamp(proj_start_date), pd.Timestamp(proj_end_date)).to_numpy()
     
-    if "Contract End Date" in df_filtered.columns and not df_filtered["Contract End Date"].isnull().all():
-        min_date_val = df_filtered["Contract End Date"].min()
-        max_date_val = df_filtered["Contract End Date"].max()
-        st.sidebar.subheader("📌 Filter by Contract End Date")
+    if "Contract End Date" in columns:
+        min_date_val, max_date_val = session_filter_memo(token, ("range", "Contract End Date", tuple(selections)),
+                                                         lambda: date_range(prepared["Contract End Date"][mask]))
         if not (pd.isna(min_date_val) or pd.isna(max_date_val)):
+            st.sidebar.subheader("📌 Filter by Contract End Date")
             start_date = st.sidebar.date_input("End Date From", min_date_val, min_value=min_date_val, max_value=max_date_val)
             end_date = st.sidebar.date_input("End Date To", max_date_val, min_value=min_date_val, max_value=max_date_val)
+            selections.append((str(start_date), str(end_date)))
             if start_date <= end_date:
-                df_filtered = df_filtered[(df_filtered["Contract End Date"] >= pd.to_datetime(start_date)) & 
-                                          (df_filtered["Contract End Date"] <= pd.to_datetime(end_date))].copy()
+                mask &= prepared["Contract End Date"].between(pd.Timestamp(start_date), pd.Timestamp(end_date)).to_numpy()
+    
+    # The sliced frame is kept for the current selections, so reruns that
+    # leave the filters alone hand the pages the same frame
+    selection_key = tuple(selections)
+    cached = st.session_state.get("filtered_frame")
+    if cached is not None and cached[0] == token and cached[1] == selection_key:
+        df_filtered = cached[2]
+    else:
+        df_filtered = filtered_frame(prepared, mask)
+        st.session_state["filtered_frame"] = (token, selection_key, df_filtered)
+    
+    # Cheap key for downstream st.cache_data helpers, which take the frame as
+    # an unhashed _df argument instead of hashing every row on each rerun. The
+    # selections go in verbatim (not hashed) so two selections never share an
+    # entry; the token is per session, so entries are not shared across sessions
+    st.session_state["data_version"] = f"{token}:{selection_key!r}"
     
     return df_filtered
 
@@ -425,8 +685,8 @@ def load_data(data_source, page):
         elif data_source == "Use Default File":
             df = load_from_default_file(page)
     
-    # Create filtered copy
-    df_filtered = df.copy()
+    # Filtering works on a shallow copy, so no deep copy is needed here
+    df_filtered = df
     
     # Handle special case for Projects & Customer Health page
     if page == "Projects & Customer Health" and not df_filtered.empty: